@@ -4,10 +4,16 @@ This package provides tools for multi-state joint modeling with PyTorch.
 """
 
 from .model import MultiStateJointModel
+from .summaries import GridQuantiles, RunningMoments, StateOccupation
 
 __version__ = "0.1.0"
 __author__ = "Félix Laplante"
 __email__ = "felixlaplante0@gmail.com"
 __license__ = "MIT"
 
-__all__ = ["MultiStateJointModel"]
+__all__ = [
+    "MultiStateJointModel",
+    "GridQuantiles",
+    "RunningMoments",
+    "StateOccupation",
+]
@@ -0,0 +1,131 @@
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import DefaultDict, Iterator
+
+import torch
+
+
+class NumericalChecker:
+    """Runtime numerical check policy for hot paths."""
+
+    def __init__(self, policy: str = "strict", every: int = 100):
+        """Initialize the numerical checker.
+
+        Args:
+            policy (str, optional): Either "strict" to check every call and warn immediately, "sampled" to check every few calls and summarize the issues, or "off". Defaults to "strict".
+            every (int, optional): The number of calls between two checks of the same site in "sampled" policy. Defaults to 100.
+
+        Raises:
+            ValueError: If policy is not in ("strict", "sampled", "off").
+            ValueError: If every is not strictly positive.
+        """
+
+        if policy not in ("strict", "sampled", "off"):
+            raise ValueError(
+                f"policy should be either strict, sampled or off, got {policy}"
+            )
+        if every <= 0:
+            raise ValueError("every must be strictly positive")
+
+        self.policy = policy
+        self.every = every
+
+        # Statistics tracking
+        self.n_calls_: DefaultDict[str, int] = defaultdict(int)
+        self.n_checks_: DefaultDict[str, int] = defaultdict(int)
+        self.n_issues_: DefaultDict[str, int] = defaultdict(int)
+
+        # Device side issue counts while checks are deferred
+        self._deferred: dict[str, torch.Tensor] | None = None
+
+    def __call__(self, tensor: torch.Tensor, message: str) -> bool:
+        """Checks a tensor for nan or inf values according to the policy.
+
+        Args:
+            tensor (torch.Tensor): The tensor to check.
+            message (str): The warning message, also used to identify the call site.
+
+        Only the strict policy reports issues to the caller, so that callers
+        may skip the invalid values. Other policies only record them, so that
+        results never depend on which calls happen to be checked.
+
+        Returns:
+            bool: True if an issue was detected with the strict policy, False otherwise.
+        """
+
+        if self.policy == "off":
+            return False
+
+        # Count on device without synchronizing
+        if self._deferred is not None:
+            invalid_count = (~torch.isfinite(tensor).all()).int()
+            prev = self._deferred.get(message)
+            self._deferred[message] = (
+                invalid_count if prev is None else prev + invalid_count
+            )
+            self.n_checks_[message] += 1
+            return False
+
+        # Only check every few calls of the same site
+        if self.policy == "sampled":
+            self.n_calls_[message] += 1
+            if (self.n_calls_[message] - 1) % self.every:
+                return False
+
+        # A single scan for both nan and inf values
+        invalid = not bool(torch.isfinite(tensor).all())
+
+        if self.policy == "strict":
+            if invalid:
+                warnings.warn(message)
+            return invalid
+
+        self.n_checks_[message] += 1
+        if invalid:
+            self.n_issues_[message] += 1
+
+        return False
+
+    @contextmanager
+    def deferred(self) -> Iterator[None]:
+        """Defers the checks of a block to a single synchronization at its end.
+
+        Inside the block, every call counts the issues on device and returns
+        False, so that callers do not skip anything. The counts are then
+        reported as a strict or sampled check would.
+
+        Yields:
+            Iterator[None]: The deferred block.
+        """
+
+        if self._deferred is not None:
+            yield
+            return
+
+        self._deferred = {}
+        try:
+            yield
+        finally:
+            deferred, self._deferred = self._deferred, None
+            if deferred:
+                counts = torch.stack(list(deferred.values())).tolist()
+                for message, n_issues in zip(deferred, counts):
+                    if n_issues == 0:
+                        continue
+                    if self.policy == "strict":
+                        warnings.warn(f"{message} ({n_issues} deferred issues)")
+                    else:
+                        self.n_issues_[message] += n_issues
+
+    def summarize(self) -> None:
+        """Warns once per call site with detected issues, then resets the counters."""
+
+        for message, n_issues in self.n_issues_.items():
+            warnings.warn(
+                f"{message} ({n_issues} out of {self.n_checks_[message]} checks)"
+            )
+
+        self.n_calls_.clear()
+        self.n_checks_.clear()
+        self.n_issues_.clear()
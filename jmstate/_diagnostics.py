@@ -0,0 +1,128 @@
+import torch
+
+
+class ChainDiagnostics:
+    """Online split R-hat and effective sample size of batched chains.
+
+    Draws of shape (K, n, q) are accumulated over a window, whose two halves
+    are treated as separate chains, so that 2K chains of length window / 2 are
+    compared for every individual and component. Only running sums are kept,
+    so that memory does not grow with the window. With many individuals, the
+    worst component is dominated by sampling noise, so convergence is judged
+    on a quantile over individuals and components instead.
+    """
+
+    def __init__(self, window: int = 100, quantile: float = 0.9):
+        """Initialize the diagnostics.
+
+        Args:
+            window (int, optional): The number of draws of a diagnostic window. Defaults to 100.
+            quantile (float, optional): The quantile of R-hat over individuals and components compared to the tolerance, the complementary quantile being used for the effective sample size. Defaults to 0.9.
+
+        Raises:
+            ValueError: If window is not an even integer of at least 4.
+            ValueError: If quantile is not in (0, 1].
+        """
+
+        if window < 4 or window % 2:
+            raise ValueError("window must be an even integer of at least 4")
+        if not 0 < quantile <= 1:
+            raise ValueError("quantile must be in (0, 1]")
+
+        self.window = window
+        self.quantile = quantile
+
+        self.rhat_: torch.Tensor | None = None
+        self.ess_: torch.Tensor | None = None
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Starts a new window."""
+
+        self.n_ = 0
+        self.sums_: list[torch.Tensor] = []
+        self.prev_: torch.Tensor | None = None
+
+    def update(self, state: torch.Tensor) -> bool:
+        """Records a draw.
+
+        Args:
+            state (torch.Tensor): The current state, of shape (K, n, q) or (n, q).
+
+        Returns:
+            bool: True if the window is complete and the diagnostics were updated.
+        """
+
+        state = state.detach()
+        if state.ndim == 2:
+            state = state.unsqueeze(0)
+
+        # Start a new half
+        half = self.window // 2
+        if self.n_ % half == 0:
+            zeros = torch.zeros_like(state)
+            # Sums of x, x^2, x_t x_{t-1}, x_t and x_{t-1} over lagged pairs
+            self.sums_.extend([zeros.clone() for _ in range(5)])
+            self.prev_ = None
+
+        s, s2, s_lag, s_cur, s_prev = self.sums_[-5:]
+        s += state
+        s2 += state**2
+        if self.prev_ is not None:
+            s_lag += state * self.prev_
+            s_cur += state
+            s_prev += self.prev_
+        self.prev_ = state
+
+        self.n_ += 1
+        if self.n_ < self.window:
+            return False
+
+        self._compute()
+        self.reset()
+
+        return True
+
+    def _compute(self) -> None:
+        """Computes split R-hat and effective sample size from the window sums."""
+
+        half = self.window // 2
+
+        # Stack the two halves as 2K chains
+        s, s2, s_lag, s_cur, s_prev = (
+            torch.cat([self.sums_[i], self.sums_[i + 5]]) for i in range(5)
+        )
+
+        # Within and between chains variances
+        means = s / half
+        variances = (s2 - half * means**2) / (half - 1)
+        within = variances.mean(dim=0)
+        between = half * means.var(dim=0)
+        var_plus = (half - 1) / half * within + between / half
+        self.rhat_ = torch.sqrt(var_plus / within.clamp(min=1e-12))
+
+        # Lag one autocorrelation, assuming an autoregressive decay
+        n_pairs = half - 1
+        lag_cov = (s_lag - s_cur * s_prev / n_pairs) / n_pairs
+        rho = (lag_cov.mean(dim=0) / var_plus.clamp(min=1e-12)).clamp(-0.99, 0.99)
+        self.ess_ = means.shape[0] * half * (1 - rho) / (1 + rho)
+
+    def converged(self, rhat_tol: float, min_ess: float = 0.0) -> bool:
+        """Checks the last diagnostics against the tolerances.
+
+        Args:
+            rhat_tol (float): The tolerance of the R-hat quantile over individuals and components.
+            min_ess (float, optional): The minimum of the complementary effective sample size quantile over individuals and components. Defaults to 0.0.
+
+        Returns:
+            bool: True if both quantiles pass.
+        """
+
+        if self.rhat_ is None or self.ess_ is None:
+            return False
+
+        rhat = torch.quantile(self.rhat_.flatten(), self.quantile)
+        ess = torch.quantile(self.ess_.flatten(), 1 - self.quantile)
+
+        return bool((rhat < rhat_tol) & (ess >= min_ess))
@@ -1,4 +1,3 @@
-import warnings
 from typing import Any, cast
 
 import numpy as np
@@ -26,6 +25,82 @@ class HazardMixin:
         self._std_nodes = torch.tensor(nodes, dtype=torch.float32)
         self._std_weights = torch.tensor(weights, dtype=torch.float32)
 
+    def _kronrod_quad(self) -> None:
+        """Get the 7 points Gauss-Kronrod nodes and weights with the embedded
+        3 points Gauss-Legendre weights.
+
+        The Gauss nodes are located at the odd indices of the Kronrod nodes.
+        The rule costs less than half the default fixed rule, so that every
+        interval accepted on the first pass saves hazard evaluations.
+        """
+
+        # Positive half of the nodes and weights
+        xgk = [
+            0.960491268708020283423507092629080,
+            0.774596669241483377035853079956480,
+            0.434243749346802558002071502844628,
+            0.000000000000000000000000000000000,
+        ]
+        wgk = [
+            0.104656226026467265193823857192073,
+            0.268488089868333440728569280666710,
+            0.401397414775962222905051818618432,
+            0.450916538658474142345110087045571,
+        ]
+        wg = [
+            0.555555555555555555555555555555556,
+            0.888888888888888888888888888888889,
+        ]
+
+        # Mirror to get the full sorted rules
+        nodes = [-v for v in xgk[:-1]] + xgk[::-1]
+        weights = wgk[:-1] + wgk[::-1]
+        gauss_weights = wg[:-1] + wg[::-1]
+
+        self._kronrod_nodes = torch.tensor(nodes, dtype=torch.float32)
+        self._kronrod_weights = torch.tensor(weights, dtype=torch.float32)
+        self._gauss_weights = torch.tensor(gauss_weights, dtype=torch.float32)
+
+    @staticmethod
+    def _flatten_chains(
+        psi: torch.Tensor,
+        *rows: torch.Tensor,
+        cache: dict[Any, Any] | None = None,
+        cache_key: Any = None,
+    ) -> tuple[torch.Tensor, ...]:
+        """Flattens the leading chain dimensions of psi into rows.
+
+        User defined functions expect a matrix of individual parameters, so
+        the per-row tensors are tiled once per chain accordingly. The tiled
+        rows are cached for the last number of chains if a cache is given.
+
+        Args:
+            psi (torch.Tensor): Individual parameters of shape (..., n, d).
+            *rows (torch.Tensor): Tensors whose first dimension is n.
+            cache (dict[Any, Any] | None, optional): Cache of the tiled rows, tied to fixed rows. Defaults to None.
+            cache_key (Any, optional): The key identifying the rows in the cache. Defaults to None.
+
+        Returns:
+            tuple[torch.Tensor, ...]: The flattened psi followed by the tiled rows.
+        """
+
+        if psi.ndim == 2:
+            return psi, *rows
+
+        n_chains = psi.shape[:-2].numel()
+        key = ("tile", cache_key)
+        entry = cache.get(key) if cache is not None else None
+
+        if entry is None or entry[0] != n_chains:
+            entry = (
+                n_chains,
+                tuple(row.repeat(n_chains, *([1] * (row.ndim - 1))) for row in rows),
+            )
+            if cache is not None:
+                cache[key] = entry
+
+        return psi.reshape(-1, psi.shape[-1]), *entry[1]
+
     def _log_hazard(
         self,
         t0: torch.Tensor,
@@ -53,24 +128,139 @@ class HazardMixin:
             torch.Tensor: The computed log hazard.
         """
 
-        # Compute baseline hazard
-        base = log_lambda0(t1, t0)
+        return self._log_hazard_from_link(
+            t0, t1, x, g(t1, x, psi), alpha, beta, log_lambda0
+        )
 
-        # Compute time-varying effects
-        mod = torch.einsum("ijk,k->ij", g(t1, x, psi), alpha)
+    def _log_hazard_from_link(
+        self,
+        t0: torch.Tensor,
+        t1: torch.Tensor,
+        x: torch.Tensor,
+        link_vals: torch.Tensor,
+        alpha: torch.Tensor,
+        beta: torch.Tensor,
+        log_lambda0: BaseFun,
+        *,
+        cache: dict[Any, Any] | None = None,
+        cache_key: Any = None,
+    ) -> torch.Tensor:
+        """Computes log hazard from already evaluated link values.
+
+        Args:
+            t0 (torch.Tensor): Start time.
+            t1 (torch.Tensor): End time.
+            x (torch.Tensor): Covariates.
+            link_vals (torch.Tensor): Link function values at t1.
+            alpha (torch.Tensor): Link linear parameters.
+            beta (torch.Tensor): Covariate linear parameters.
+            log_lambda0 (BaseFun): Base hazard function.
+            cache (dict[Any, Any] | None, optional): Cache of the terms not depending on the individual parameters, tied to fixed t0, t1 and x. Defaults to None.
+            cache_key (Any, optional): The key identifying the transition in the cache. Defaults to None.
+
+        Returns:
+            torch.Tensor: The computed log hazard.
+        """
+
+        if cache is not None:
+            base = self._cached_base(cache, cache_key, t0, t1, log_lambda0)
+            cov = self._cached_cov(cache, cache_key, x, beta)
+        else:
+            # Compute baseline hazard
+            base = log_lambda0(t1, t0)
+
+            # Compute covariates effect
+            cov = x @ beta.unsqueeze(1)
 
-        # Compute covariates effect
-        cov = x @ beta.unsqueeze(1)
+        # Compute time-varying effects
+        mod = torch.einsum("...k,k->...", link_vals, alpha)
 
         # Compute the total
         log_hazard_vals = base + mod + cov
 
         # Check for numerical issues
-        if torch.isnan(log_hazard_vals).any() or torch.isinf(log_hazard_vals).any():
-            warnings.warn("Numerical issues in log hazard computation")
+        self._checker(log_hazard_vals, "Numerical issues in log hazard computation")
 
         return log_hazard_vals
 
+    def _cached_base(
+        self,
+        cache: dict[Any, Any],
+        cache_key: Any,
+        t0: torch.Tensor,
+        t1: torch.Tensor,
+        log_lambda0: BaseFun,
+    ) -> torch.Tensor:
+        """Gets the baseline hazard, cached when it has no learnable parameters.
+
+        Args:
+            cache (dict[Any, Any]): The cache tied to fixed t0 and t1.
+            cache_key (Any): The key identifying the transition in the cache.
+            t0 (torch.Tensor): Start time.
+            t1 (torch.Tensor): End time.
+            log_lambda0 (BaseFun): Base hazard function.
+
+        Returns:
+            torch.Tensor: The computed baseline log hazard.
+        """
+
+        key = ("base", cache_key)
+        base = cache.get(key)
+
+        if base is False:
+            return log_lambda0(t1, t0)
+
+        if base is not None:
+            return base
+
+        # Detect learnable parameters through the autograd graph
+        with torch.enable_grad():
+            base = log_lambda0(t1, t0)
+
+        if not torch.is_tensor(base) or not base.requires_grad:
+            cache[key] = base
+            return base
+
+        # Never cache a baseline with learnable parameters
+        cache[key] = False
+
+        return base if torch.is_grad_enabled() else base.detach()
+
+    def _cached_cov(
+        self,
+        cache: dict[Any, Any],
+        cache_key: Any,
+        x: torch.Tensor,
+        beta: torch.Tensor,
+    ) -> torch.Tensor:
+        """Gets the covariates effect, cached until beta is updated.
+
+        Only values computed without gradient tracking are cached, so that a
+        graph is never shared between two backward passes.
+
+        Args:
+            cache (dict[Any, Any]): The cache tied to fixed x.
+            cache_key (Any): The key identifying the transition in the cache.
+            x (torch.Tensor): Covariates.
+            beta (torch.Tensor): Covariate linear parameters.
+
+        Returns:
+            torch.Tensor: The computed covariates effect.
+        """
+
+        if torch.is_grad_enabled():
+            return x @ beta.unsqueeze(1)
+
+        key = ("cov", cache_key)
+        entry = cache.get(key)
+
+        # Parameter updates are in-place, tracked by the version counter
+        if entry is None or entry[0] is not beta or entry[1] != beta._version:
+            entry = (beta, beta._version, x @ beta.unsqueeze(1))
+            cache[key] = entry
+
+        return entry[2]
+
     def _cum_hazard(
         self,
         t0: torch.Tensor,
@@ -81,6 +271,8 @@ class HazardMixin:
         beta: torch.Tensor,
         log_lambda0: BaseFun,
         g: LinkFun,
+        *,
+        closed_form: ClosedFormHazard | None = None,
     ) -> torch.Tensor:
         """Computes cumulative hazard.
 
@@ -93,17 +285,71 @@ class HazardMixin:
             beta (torch.Tensor): Covariate linear parameters.
             log_lambda0 (BaseFun): Base hazard function.
             g (LinkFun): Link function.
+            closed_form (ClosedFormHazard | None, optional): Exact cumulative hazard used instead of quadrature. Defaults to None.
 
         Returns:
             torch.Tensor: The computed cumulative hazard.
         """
 
+        # Use the exact cumulative hazard if available
+        if closed_form is not None:
+            return closed_form.cum_hazard(
+                t0.flatten(), t1.flatten(), x, psi, alpha, beta
+            )
+
+        return self._int_hazard(t0, t0, t1, x, psi, alpha, beta, log_lambda0, g)
+
+    def _int_hazard(
+        self,
+        t0: torch.Tensor,
+        a: torch.Tensor,
+        b: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        alpha: torch.Tensor,
+        beta: torch.Tensor,
+        log_lambda0: BaseFun,
+        g: LinkFun,
+        *,
+        closed_form: ClosedFormHazard | None = None,
+    ) -> torch.Tensor:
+        """Integrates the hazard of a sojourn started at t0 between a and b.
+
+        Args:
+            t0 (torch.Tensor): Start time of the sojourn.
+            a (torch.Tensor): Lower integration bound.
+            b (torch.Tensor): Upper integration bound.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters.
+            alpha (torch.Tensor): Link linear parameters.
+            beta (torch.Tensor): Covariate linear parameters.
+            log_lambda0 (BaseFun): Base hazard function.
+            g (LinkFun): Link function.
+            closed_form (ClosedFormHazard | None, optional): Exact cumulative hazard used instead of quadrature. Defaults to None.
+
+        Returns:
+            torch.Tensor: The computed hazard integral.
+        """
+
+        # Use the exact cumulative hazard if available
+        if closed_form is not None:
+            t0 = t0.flatten()
+            return closed_form.cum_hazard(
+                t0, b.flatten(), x, psi, alpha, beta
+            ) - closed_form.cum_hazard(t0, a.flatten(), x, psi, alpha, beta)
+
+        # Use adaptive quadrature if a tolerance is set
+        if self.quad_tol is not None:
+            return self._adaptive_int_hazards(
+                t0, a, b, x, psi, [(alpha, beta, log_lambda0)], g
+            )[0][1]
+
         # Reshape for broadcasting
-        t0, t1 = t0.view(-1, 1), t1.view(-1, 1)
+        t0, a, b = t0.view(-1, 1), a.view(-1, 1), b.view(-1, 1)
 
         # Transform to quadrature interval [-1, 1]
-        mid = 0.5 * (t0 + t1)
-        half = 0.5 * (t1 - t0)
+        mid = 0.5 * (a + b)
+        half = 0.5 * (b - a)
 
         # Evaluate at quadrature points
         ts = mid + half * self._std_nodes
@@ -115,12 +361,271 @@ class HazardMixin:
         hazard_vals = torch.exp(torch.clamp(log_hazard_vals, min=-50.0, max=50.0))
 
         # Check for numerical issues
-        if torch.isnan(hazard_vals).any() or torch.isinf(hazard_vals).any():
-            warnings.warn("Numerical issues in hazard computation")
+        self._checker(hazard_vals, "Numerical issues in hazard computation")
+
+        int_hazard_vals = half.flatten() * (hazard_vals * self._std_weights).sum(dim=1)
+
+        return int_hazard_vals
+
+    def _cum_hazards_at(
+        self,
+        t0: torch.Tensor,
+        u: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        alpha: torch.Tensor,
+        beta: torch.Tensor,
+        log_lambda0: BaseFun,
+        g: LinkFun,
+    ) -> torch.Tensor:
+        """Computes cumulative hazards from t0 to several sorted horizons on a
+        single shared grid.
 
-        cum_hazard_vals = half.flatten() * (hazard_vals * self._std_weights).sum(dim=1)
+        The interval from t0 to the last horizon is split into n_quad / 2
+        uniform cells, further split at the horizons, and every cell is
+        integrated with the 2 points Gauss rule. The cells are accumulated
+        once, so that a row costs n_quad + 2 * eval_points evaluations instead
+        of n_quad * eval_points.
 
-        return cum_hazard_vals
+        Args:
+            t0 (torch.Tensor): Start time, with one entry per row.
+            u (torch.Tensor): The sorted horizons, not before t0, of shape (n, eval_points).
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters.
+            alpha (torch.Tensor): Link linear parameters.
+            beta (torch.Tensor): Covariate linear parameters.
+            log_lambda0 (BaseFun): Base hazard function.
+            g (LinkFun): Link function.
+
+        Returns:
+            torch.Tensor: The cumulative hazards, of shape (n, eval_points).
+        """
+
+        # Reshape for broadcasting
+        t0 = t0.view(-1, 1)
+        n_cells = max(self.n_quad // 2, 1)
+
+        # Merge the uniform breakpoints with the horizons, keeping their ranks
+        steps = torch.linspace(0.0, 1.0, n_cells + 1)
+        grid = t0 + (u[:, -1:] - t0) * steps
+        bounds, perm = torch.cat([grid, u], dim=1).sort(dim=1)
+        pos = perm.argsort(dim=1)[:, n_cells + 1 :]
+
+        # Evaluate at the two Gauss points of every cell
+        mid = 0.5 * (bounds[:, :-1] + bounds[:, 1:])
+        half = 0.5 * (bounds[:, 1:] - bounds[:, :-1])
+        ts = torch.cat([mid - half / 3**0.5, mid + half / 3**0.5], dim=1)
+
+        # Compute hazard at quadrature points
+        log_hazard_vals = self._log_hazard(t0, ts, x, psi, alpha, beta, log_lambda0, g)
+        hazard_vals = torch.exp(torch.clamp(log_hazard_vals, min=-50.0, max=50.0))
+
+        # Check for numerical issues
+        self._checker(hazard_vals, "Numerical issues in hazard computation")
+
+        # Accumulate the cells, the first breakpoint being t0
+        cells = half * hazard_vals.view(-1, 2, half.shape[1]).sum(dim=1)
+        cum_hazard_vals = torch.cat([torch.zeros_like(t0), cells.cumsum(dim=1)], dim=1)
+
+        return cum_hazard_vals.gather(1, pos)
+
+    def _kronrod_estimate(
+        self, hazard_vals: torch.Tensor, half: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Integrates hazard values at the Kronrod nodes and estimates the error.
+
+        The difference with the embedded Gauss rule is rescaled as in QUADPACK,
+        since it mostly measures the error of the far less accurate Gauss rule.
+
+        Args:
+            hazard_vals (torch.Tensor): The hazard at the Kronrod nodes, of shape (..., 7).
+            half (torch.Tensor): The half widths of the intervals, of shape (...).
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: A tuple containing the Kronrod estimate and its detached error estimate.
+        """
+
+        kronrod = half * (hazard_vals * self._kronrod_weights).sum(dim=-1)
+        gauss = half * (hazard_vals[..., 1::2] * self._gauss_weights).sum(dim=-1)
+
+        with torch.no_grad():
+            err = (kronrod - gauss).abs()
+
+            # Spread of the integrand around its mean
+            mean = (hazard_vals * self._kronrod_weights).sum(dim=-1, keepdim=True) / 2
+            resasc = half.abs() * (
+                (hazard_vals - mean).abs() * self._kronrod_weights
+            ).sum(dim=-1)
+            ratio = torch.clamp(200 * err / torch.clamp(resasc, min=1e-30), max=1.0)
+            err = torch.where(resasc > 0, resasc * ratio**1.5, err)
+
+        return kronrod, err
+
+    def _adaptive_int_hazards(
+        self,
+        t0: torch.Tensor,
+        a: torch.Tensor,
+        b: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        transitions: list[tuple[torch.Tensor, torch.Tensor, BaseFun]],
+        g: LinkFun,
+        *,
+        endpoint: bool = False,
+        cache: dict[Any, Any] | None = None,
+        cache_keys: list[Any] | None = None,
+    ) -> list[tuple[torch.Tensor | None, torch.Tensor]]:
+        """Integrates the hazards of transitions sharing the same sojourns and
+        link function between a and b with adaptive Gauss-Kronrod quadrature.
+
+        Every interval is first integrated as a whole on a grid shared by the
+        transitions and the chains, whose terms not depending on the individual
+        parameters are cached. Intervals failing the tolerance for any
+        transition are then bisected, until the errors of their row sum under
+        the tolerance or every subinterval meets its share proportional to its
+        width. All subintervals are processed together at each depth, with a
+        single evaluation of the link function.
+
+        Args:
+            t0 (torch.Tensor): Start time of the sojourns, with one entry per sojourn.
+            a (torch.Tensor): Lower integration bound, with one entry per sojourn.
+            b (torch.Tensor): Upper integration bound, with one entry per sojourn.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters, possibly with leading chain dimensions.
+            transitions (list[tuple[torch.Tensor, torch.Tensor, BaseFun]]): The alpha, beta and base hazard of each transition.
+            g (LinkFun): Link function.
+            endpoint (bool, optional): Whether to also compute the log hazard at b. Defaults to False.
+            cache (dict[Any, Any] | None, optional): Cache of the terms not depending on the individual parameters, tied to fixed t0, a, b and x. Defaults to None.
+            cache_keys (list[Any] | None, optional): The keys identifying each transition in the cache. Defaults to None.
+
+        Returns:
+            list[tuple[torch.Tensor | None, torch.Tensor]]: A tuple containing the log hazard at b, None without endpoint, and the hazard integral for each transition, with the leading dimensions of psi.
+        """
+
+        # Reshape for broadcasting
+        t0, a, b = t0.view(-1, 1), a.view(-1, 1), b.view(-1, 1)
+        lead = psi.shape[:-1]
+        n_nodes = self._kronrod_nodes.numel()
+
+        # First pass on the whole intervals, shared by all chains
+        half = 0.5 * (b - a)
+        ts = 0.5 * (a + b) + half * self._kronrod_nodes
+        if endpoint:
+            ts = torch.cat([b, ts], dim=1)
+
+        psi_flat, ts_flat, x_flat, t0_flat, a_flat, b_flat = self._flatten_chains(
+            psi,
+            ts,
+            x,
+            t0,
+            a,
+            b,
+            cache=cache,
+            cache_key=("adaptive", *cache_keys) if cache_keys is not None else None,
+        )
+        link_vals = g(ts_flat, x_flat, psi_flat)
+        link_vals = link_vals.view(*lead, *link_vals.shape[1:])
+        n_rows = psi_flat.shape[0]
+        n_evals = n_rows * ts.shape[1]
+
+        keys: list[Any] = (
+            [("adaptive", key) for key in cache_keys]
+            if cache_keys is not None
+            else [None] * len(transitions)
+        )
+
+        log_hazards: list[torch.Tensor | None] = []
+        totals: list[torch.Tensor] = []
+        errs: list[torch.Tensor] = []
+
+        for key, (alpha, beta, log_lambda0) in zip(keys, transitions):
+            temp = self._log_hazard_from_link(
+                t0,
+                ts,
+                x,
+                link_vals,
+                alpha,
+                beta,
+                log_lambda0,
+                cache=cache,
+                cache_key=key,
+            )
+            hazard_vals = torch.exp(
+                torch.clamp(temp[..., -n_nodes:], min=-50.0, max=50.0)
+            )
+            est, err = self._kronrod_estimate(hazard_vals, half.flatten())
+
+            log_hazards.append(temp[..., 0] if endpoint else None)
+            totals.append(est.reshape(-1))
+            errs.append(err.reshape(-1))
+
+        # Each row gets a tolerance relative to the magnitude of its integrals
+        scale = torch.clamp(torch.stack(totals).detach().abs().amax(dim=0), min=1.0)
+        row_tol = cast(float, self.quad_tol) * scale
+        width = torch.clamp((b_flat - a_flat).abs().flatten(), min=1e-12)
+        err = torch.stack(errs).amax(dim=0)
+        done = err <= row_tol
+
+        totals = [torch.where(done, total, torch.zeros_like(total)) for total in totals]
+        row_err = torch.where(done, err, torch.zeros_like(err))
+        rows = (~done).nonzero().flatten()
+        a_rows, b_rows = a_flat[rows], b_flat[rows]
+
+        for depth in range(1, self.quad_max_depth + 1):
+            if rows.numel() == 0:
+                break
+
+            # Bisect the failing subintervals
+            mid = 0.5 * (a_rows + b_rows)
+            rows = torch.cat([rows, rows])
+            a_rows, b_rows = torch.cat([a_rows, mid]), torch.cat([mid, b_rows])
+
+            half = 0.5 * (b_rows - a_rows)
+            ts = 0.5 * (a_rows + b_rows) + half * self._kronrod_nodes
+            link_vals = g(ts, x_flat[rows], psi_flat[rows])
+            n_evals += rows.numel() * n_nodes
+
+            ests: list[torch.Tensor] = []
+            errs = []
+            for alpha, beta, log_lambda0 in transitions:
+                temp = self._log_hazard_from_link(
+                    t0_flat[rows],
+                    ts,
+                    x_flat[rows],
+                    link_vals,
+                    alpha,
+                    beta,
+                    log_lambda0,
+                )
+                hazard_vals = torch.exp(torch.clamp(temp, min=-50.0, max=50.0))
+                est, err = self._kronrod_estimate(hazard_vals, half.flatten())
+                ests.append(est)
+                errs.append(err)
+
+            # A subinterval is accepted if its row meets the tolerance as a
+            # whole, or if it meets its share proportional to its width
+            err = torch.stack(errs).amax(dim=0)
+            total_err = row_err.index_add(0, rows, err)
+            share = (b_rows - a_rows).abs().flatten() / width[rows]
+            done = (total_err[rows] <= row_tol[rows]) | (err <= row_tol[rows] * share)
+            done |= depth == self.quad_max_depth
+            row_err = row_err.index_add(0, rows, torch.where(done, err, 0.0))
+
+            totals = [
+                total.index_add(0, rows, torch.where(done, est, torch.zeros_like(est)))
+                for total, est in zip(totals, ests)
+            ]
+
+            refine = ~done
+            rows, a_rows, b_rows = rows[refine], a_rows[refine], b_rows[refine]
+
+        # Report the evaluations saved compared with the fixed rule
+        self.quad_evals_saved_ += n_rows * (self.n_quad + int(endpoint)) - n_evals
+
+        return [
+            (log_hazard, total.view(lead))
+            for log_hazard, total in zip(log_hazards, totals)
+        ]
 
     def _log_and_cum_hazard(
         self,
@@ -152,6 +657,88 @@ class HazardMixin:
             tuple[torch.Tensor, torch.Tensor]: A tuple containing log and cumulative hazard.
         """
 
+        return self._log_and_cum_hazards(
+            t0, t1, x, psi, [(alpha, beta, log_lambda0)], g
+        )[0]
+
+    def _log_and_cum_hazards(
+        self,
+        t0: torch.Tensor,
+        t1: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        transitions: list[tuple[torch.Tensor, torch.Tensor, BaseFun]],
+        g: LinkFun,
+        *,
+        cache: dict[Any, Any] | None = None,
+        cache_keys: list[Any] | None = None,
+    ) -> list[tuple[torch.Tensor, torch.Tensor]]:
+        """Computes both log and cumulative hazard of transitions sharing the
+        same sojourns and link function.
+
+        The link function is evaluated once on the shared quadrature grid, each
+        transition only applying its own parameters and base hazard.
+
+        Args:
+            t0 (torch.Tensor): Start time.
+            t1 (torch.Tensor): End time.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters.
+            transitions (list[tuple[torch.Tensor, torch.Tensor, BaseFun]]): The alpha, beta and base hazard of each transition.
+            g (LinkFun): Link function.
+            cache (dict[Any, Any] | None, optional): Cache of the terms not depending on the individual parameters, tied to fixed t0, t1 and x. Defaults to None.
+            cache_keys (list[Any] | None, optional): The keys identifying each transition in the cache. Defaults to None.
+
+        Returns:
+            list[tuple[torch.Tensor, torch.Tensor]]: A tuple containing log and cumulative hazard for each transition.
+        """
+
+        # Use adaptive quadrature if a tolerance is set
+        if self.quad_tol is not None:
+            return [
+                (cast(torch.Tensor, log_hazard_vals), cum_hazard_vals)
+                for log_hazard_vals, cum_hazard_vals in self._adaptive_int_hazards(
+                    t0,
+                    t0,
+                    t1,
+                    x,
+                    psi,
+                    transitions,
+                    g,
+                    endpoint=True,
+                    cache=cache,
+                    cache_keys=cache_keys,
+                )
+            ]
+
+        # Build the quadrature grid
+        ts, hw = self._quad_grid(t0, t1)
+
+        return self._log_and_cum_hazards_on_grid(
+            t0.view(-1, 1),
+            ts,
+            hw,
+            x,
+            psi,
+            transitions,
+            g,
+            cache=cache,
+            cache_keys=cache_keys,
+        )
+
+    def _quad_grid(
+        self, t0: torch.Tensor, t1: torch.Tensor
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Builds the Gauss-Legendre grid used by _log_and_cum_hazards_on_grid.
+
+        Args:
+            t0 (torch.Tensor): Start time.
+            t1 (torch.Tensor): End time.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: A tuple containing the endpoint followed by the quadrature points, and the weights scaled by the half widths.
+        """
+
         # Reshape for broadcasting
         t0, t1 = t0.view(-1, 1), t1.view(-1, 1)
 
@@ -162,19 +749,78 @@ class HazardMixin:
         # Combine endpoint and quadrature points
         ts = torch.cat([t1, mid + half * self._std_nodes], dim=1)
 
-        # Compute log hazard at all points
-        temp = self._log_hazard(t0, ts, x, psi, alpha, beta, log_lambda0, g)
+        return ts, half * self._std_weights
 
-        # Extract log hazard at endpoint and quadrature points
-        log_hazard_vals = temp[:, :1]  # Log hazard at t1
-        hazard_vals = torch.exp(
-            torch.clamp(temp[:, 1:], min=-50.0, max=50.0)
-        )  # Hazard at quadrature points
+    def _log_and_cum_hazards_on_grid(
+        self,
+        t0: torch.Tensor,
+        ts: torch.Tensor,
+        hw: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        transitions: list[tuple[torch.Tensor, torch.Tensor, BaseFun]],
+        g: LinkFun,
+        *,
+        cache: dict[Any, Any] | None = None,
+        cache_keys: list[Any] | None = None,
+    ) -> list[tuple[torch.Tensor, torch.Tensor]]:
+        """Computes both log and cumulative hazard of transitions sharing the
+        same precompiled quadrature grid and link function.
 
-        # Compute cumulative hazard using quadrature
-        cum_hazard_vals = half.flatten() * (hazard_vals * self._std_weights).sum(dim=1)
+        Args:
+            t0 (torch.Tensor): Start time, of shape (n, 1).
+            ts (torch.Tensor): Endpoint followed by the quadrature points.
+            hw (torch.Tensor): Quadrature weights scaled by the half widths.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters, possibly with leading chain dimensions.
+            transitions (list[tuple[torch.Tensor, torch.Tensor, BaseFun]]): The alpha, beta and base hazard of each transition.
+            g (LinkFun): Link function.
+            cache (dict[Any, Any] | None, optional): Cache of the terms not depending on the individual parameters, tied to the grid and x. Defaults to None.
+            cache_keys (list[Any] | None, optional): The keys identifying each transition in the cache. Defaults to None.
 
-        return log_hazard_vals.flatten(), cum_hazard_vals
+        Returns:
+            list[tuple[torch.Tensor, torch.Tensor]]: A tuple containing log and cumulative hazard for each transition.
+        """
+
+        # Evaluate the shared link function once, for all chains
+        psi_flat, ts_flat, x_flat = self._flatten_chains(
+            psi,
+            ts,
+            x,
+            cache=cache,
+            cache_key=("grid", *cache_keys) if cache_keys is not None else None,
+        )
+        link_vals = g(ts_flat, x_flat, psi_flat)
+        link_vals = link_vals.view(*psi.shape[:-1], *link_vals.shape[1:])
+
+        results: list[tuple[torch.Tensor, torch.Tensor]] = []
+
+        for i, (alpha, beta, log_lambda0) in enumerate(transitions):
+            # Compute log hazard at all points
+            temp = self._log_hazard_from_link(
+                t0,
+                ts,
+                x,
+                link_vals,
+                alpha,
+                beta,
+                log_lambda0,
+                cache=cache,
+                cache_key=cache_keys[i] if cache_keys is not None else None,
+            )
+
+            # Extract log hazard at endpoint and quadrature points
+            log_hazard_vals = temp[..., 0]  # Log hazard at t1
+            hazard_vals = torch.exp(
+                torch.clamp(temp[..., 1:], min=-50.0, max=50.0)
+            )  # Hazard at quadrature points
+
+            # Compute cumulative hazard using quadrature
+            cum_hazard_vals = (hazard_vals * hw).sum(dim=-1)
+
+            results.append((log_hazard_vals, cum_hazard_vals))
+
+        return results
 
     def _sample_trajectory_step(
         self,
@@ -189,9 +835,18 @@ class HazardMixin:
         *,
         c: torch.Tensor | None = None,
         n_bissect: int,
+        atol: float = 1e-6,
+        rtol: float = 1e-6,
+        closed_form: ClosedFormHazard | None = None,
     ) -> torch.Tensor:
         """Sample survival times using inverse transform sampling.
 
+        The cumulative hazard equation is solved with a safeguarded Newton
+        method using the hazard as derivative. Only the hazard increment
+        between two iterates is integrated, a bisection step is taken whenever
+        the Newton step leaves the bracket, and converged rows are removed
+        from the active set.
+
         Args:
             t_left (torch.Tensor): Left sampling time.
             t_right (torch.Tensor): Right censoring sampling time.
@@ -201,39 +856,286 @@ class HazardMixin:
             beta (torch.Tensor): Covariate linear parameters.
             log_lambda0 (BaseFun): Base hazard function.
             g (LinkFun): Link function.
-            n_bissect (int): _description_
-            c (torch.Tensor | None, optional): _description_. Defaults to None.
+            c (torch.Tensor | None, optional): Conditioning survival times. Defaults to None.
+            n_bissect (int): The maximum number of root finding iterations.
+            atol (float, optional): Absolute time tolerance. Defaults to 1e-6.
+            rtol (float, optional): Relative time tolerance. Defaults to 1e-6.
+            closed_form (ClosedFormHazard | None, optional): Exact cumulative hazard used instead of quadrature, and inverted directly if it provides inv_cum_hazard. Defaults to None.
 
         Returns:
             torch.Tensor: The computed pre transition times.
         """
 
+        # Invert the exact cumulative hazard if available
+        if hasattr(closed_form, "inv_cum_hazard"):
+            return self._sample_closed_form_step(
+                t_left, t_right, x, psi, alpha, beta, closed_form, c=c
+            )
+
         n = x.shape[0]
 
-        # Initialize for bisection search
+        # Initialize the bracket
         t0 = t_left.clone().view(-1, 1)
-        t_left, t_right = t_left.view(-1, 1), t_right.view(-1, 1)
+        lo, hi = t_left.clone().view(-1, 1), t_right.clone().view(-1, 1)
 
         # Generate exponential random variables
         target = -torch.log(torch.clamp(torch.rand(n), min=1e-8))
 
-        # Adjust target if conditioning on existing survival
-        if c is not None:
-            c = c.view(-1, 1)
-            cond_hazard = self._cum_hazard(t0, c, x, psi, alpha, beta, log_lambda0, g)
-            target += cond_hazard
+        with torch.no_grad():
+            # Adjust target if conditioning on existing survival
+            if c is not None:
+                c = c.view(-1, 1)
+                cond_hazard = self._cum_hazard(
+                    t0, c, x, psi, alpha, beta, log_lambda0, g, closed_form=closed_form
+                )
+                target += cond_hazard
+
+            # Rows not reaching the target before t_right keep the upper bound
+            cum_right = self._cum_hazard(
+                t0, hi, x, psi, alpha, beta, log_lambda0, g, closed_form=closed_form
+            )
+            t_sample = hi.flatten().clone()
+
+            active = torch.nonzero(cum_right >= target).flatten()
+            t0, lo, hi = t0[active], lo[active], hi[active]
+            x, psi = x[active], psi[active]
+            target, cum_right = target[active], cum_right[active]
+
+            # Start from the linear interpolation of the cumulative hazard
+            frac = (target / torch.clamp(cum_right, min=1e-12)).view(-1, 1)
+            t = lo + frac * (hi - lo)
+            f_vals = (
+                self._cum_hazard(
+                    t0, t, x, psi, alpha, beta, log_lambda0, g, closed_form=closed_form
+                )
+                - target
+            )
+
+            for _ in range(n_bissect):
+                if active.numel() == 0:
+                    break
+
+                # Update the bracket
+                below = (f_vals < 0).view(-1, 1)
+                lo = torch.where(below, t, lo)
+                hi = torch.where(below, hi, t)
+
+                # Newton step with the hazard as derivative
+                log_hazard_vals = self._log_hazard(
+                    t0, t, x, psi, alpha, beta, log_lambda0, g
+                )
+                hazard_vals = torch.exp(
+                    torch.clamp(log_hazard_vals, min=-50.0, max=50.0)
+                )
+                t_new = t - f_vals.view(-1, 1) / hazard_vals
 
-        # Bisection search for survival times
-        for _ in range(n_bissect):
-            t_mid = 0.5 * (t_left + t_right)
+                # Fall back to bisection outside of the bracket
+                inside = (t_new > lo) & (t_new < hi)
+                t_new = torch.where(inside, t_new, 0.5 * (lo + hi))
 
-            cumulative = self._cum_hazard(
-                t0, t_mid, x, psi, alpha, beta, log_lambda0, g
+                # Integrate only the increment between iterates
+                f_vals = f_vals + self._int_hazard(
+                    t0,
+                    t,
+                    t_new,
+                    x,
+                    psi,
+                    alpha,
+                    beta,
+                    log_lambda0,
+                    g,
+                    closed_form=closed_form,
+                )
+
+                # Check convergence on the time scale
+                tol = atol + rtol * t_new.abs()
+                done = (((t_new - t).abs() <= tol) | ((hi - lo) <= tol)).flatten()
+                t = t_new
+                t_sample[active] = t.flatten()
+
+                # Shrink the active set
+                keep = ~done
+                active = active[keep]
+                t0, t, lo, hi = t0[keep], t[keep], lo[keep], hi[keep]
+                x, psi, f_vals = x[keep], psi[keep], f_vals[keep]
+
+        return t_sample
+
+    def _interp(
+        self, xp: torch.Tensor, fp: torch.Tensor, x: torch.Tensor
+    ) -> torch.Tensor:
+        """Linearly interpolates row-wise tabulated functions.
+
+        Args:
+            xp (torch.Tensor): Sorted abscissas, one row per function.
+            fp (torch.Tensor): Ordinates, one row per function.
+            x (torch.Tensor): Evaluation points, one row per function.
+
+        Returns:
+            torch.Tensor: The interpolated values, clamped to the table ends.
+        """
+
+        # Locate the enclosing cells
+        k = torch.searchsorted(xp, x.contiguous())
+        k = torch.clamp(k, min=1, max=xp.shape[1] - 1)
+
+        x_lo, x_hi = xp.gather(1, k - 1), xp.gather(1, k)
+        f_lo, f_hi = fp.gather(1, k - 1), fp.gather(1, k)
+
+        # Local linear interpolation
+        w = (x - x_lo) / torch.clamp(x_hi - x_lo, min=1e-12)
+        w = torch.clamp(w, min=0.0, max=1.0)
+
+        return f_lo + w * (f_hi - f_lo)
+
+    def _sample_trajectory_step_tab(
+        self,
+        t_left: torch.Tensor,
+        t_right: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        alpha: torch.Tensor,
+        beta: torch.Tensor,
+        log_lambda0: BaseFun,
+        g: LinkFun,
+        *,
+        c: torch.Tensor | None = None,
+        n_grid: int,
+        closed_form: ClosedFormHazard | None = None,
+    ) -> torch.Tensor:
+        """Sample survival times by inverting a tabulated cumulative hazard.
+
+        The hazard is evaluated once on a per-row grid between t_left and
+        t_right and accumulated with the trapezoidal rule. Identical rows, such
+        as replicates sharing the same individual parameters, share a single
+        table. Every exponential target is then inverted by local linear
+        interpolation.
+
+        Args:
+            t_left (torch.Tensor): Left sampling time.
+            t_right (torch.Tensor): Right censoring sampling time.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters.
+            alpha (torch.Tensor): Link linear parameters.
+            beta (torch.Tensor): Covariate linear parameters.
+            log_lambda0 (BaseFun): Base hazard function.
+            g (LinkFun): Link function.
+            c (torch.Tensor | None, optional): Conditioning survival times. Defaults to None.
+            n_grid (int): The number of grid cells of the table.
+            closed_form (ClosedFormHazard | None, optional): Exact cumulative hazard used to fill the table, and inverted directly if it provides inv_cum_hazard. Defaults to None.
+
+        Returns:
+            torch.Tensor: The computed pre transition times.
+        """
+
+        # Invert the exact cumulative hazard if available
+        if hasattr(closed_form, "inv_cum_hazard"):
+            return self._sample_closed_form_step(
+                t_left, t_right, x, psi, alpha, beta, closed_form, c=c
             )
 
-            # Update search bounds
-            accept_mask = cumulative < target
-            t_left[accept_mask] = t_mid[accept_mask]
-            t_right[~accept_mask] = t_mid[~accept_mask]
+        n = x.shape[0]
+
+        # Generate exponential random variables
+        target = -torch.log(torch.clamp(torch.rand(n), min=1e-8))
+
+        with torch.no_grad():
+            # Share the tables between identical rows
+            keys = torch.cat(
+                [t_left.view(-1, 1), t_right.view(-1, 1), x, psi.detach()], dim=1
+            )
+            uniq, inverse = torch.unique(keys, dim=0, return_inverse=True)
+            first = torch.zeros(uniq.shape[0], dtype=torch.int64).scatter_(
+                0, inverse, torch.arange(n)
+            )
+
+            # Build the per-row grids
+            t0 = t_left.view(-1, 1)[first]
+            t1 = t_right.view(-1, 1)[first]
+            steps = torch.linspace(0.0, 1.0, n_grid + 1)
+            grid = t0 + (t1 - t0) * steps
+
+            if closed_form is not None:
+                # Tabulate the exact cumulative hazard
+                cum = closed_form.cum_hazard(
+                    t0.expand_as(grid).flatten(),
+                    grid.flatten(),
+                    x[first].repeat_interleave(n_grid + 1, dim=0),
+                    psi[first].repeat_interleave(n_grid + 1, dim=0),
+                    alpha,
+                    beta,
+                ).view_as(grid)
+            else:
+                # Tabulate the cumulative hazard with the trapezoidal rule
+                log_hazard_vals = self._log_hazard(
+                    t0, grid, x[first], psi[first], alpha, beta, log_lambda0, g
+                )
+                hazard_vals = torch.exp(
+                    torch.clamp(log_hazard_vals, min=-50.0, max=50.0)
+                )
+                cells = (
+                    0.5 * (hazard_vals[:, 1:] + hazard_vals[:, :-1]) * grid.diff(dim=1)
+                )
+                cum = torch.cat(
+                    [torch.zeros(grid.shape[0], 1), cells.cumsum(dim=1)], dim=1
+                )
+
+            # Expand back to the rows
+            grid, cum = grid[inverse], cum[inverse]
+
+            # Adjust target if conditioning on existing survival
+            if c is not None:
+                target += self._interp(grid, cum, c.view(-1, 1)).flatten()
+
+            # Invert the table, rows beyond the table keep the upper bound
+            t_sample = self._interp(cum, grid, target.view(-1, 1)).flatten()
+            t_sample = torch.where(target > cum[:, -1], t_right.flatten(), t_sample)
+
+        return t_sample
+
+    def _sample_closed_form_step(
+        self,
+        t_left: torch.Tensor,
+        t_right: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        alpha: torch.Tensor,
+        beta: torch.Tensor,
+        closed_form: ClosedFormHazard,
+        *,
+        c: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        """Sample survival times by inverting an exact cumulative hazard.
+
+        Args:
+            t_left (torch.Tensor): Left sampling time.
+            t_right (torch.Tensor): Right censoring sampling time.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters.
+            alpha (torch.Tensor): Link linear parameters.
+            beta (torch.Tensor): Covariate linear parameters.
+            closed_form (ClosedFormHazard): Exact cumulative hazard providing inv_cum_hazard.
+            c (torch.Tensor | None, optional): Conditioning survival times. Defaults to None.
+
+        Returns:
+            torch.Tensor: The computed pre transition times.
+        """
+
+        n = x.shape[0]
+        t0, t_right = t_left.flatten(), t_right.flatten()
+
+        # Generate exponential random variables
+        target = -torch.log(torch.clamp(torch.rand(n), min=1e-8))
+
+        with torch.no_grad():
+            # Adjust target if conditioning on existing survival
+            if c is not None:
+                target += closed_form.cum_hazard(t0, c.flatten(), x, psi, alpha, beta)
+
+            # Invert, rows beyond t_right keep the upper bound
+            t_sample = closed_form.inv_cum_hazard(  # type: ignore
+                t0, target, x, psi, alpha, beta
+            )
+            t_sample = torch.minimum(t_sample, t_right)
 
-        return t_right.flatten()
+        return t_sample
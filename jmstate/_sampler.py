@@ -1,28 +1,51 @@
 import warnings
-from typing import Callable
+from contextlib import contextmanager
+from typing import Callable, Iterator, cast
 
 import torch
 
+from ._checks import NumericalChecker
+from ._diagnostics import ChainDiagnostics
+
 
 class MetropolisHastingsSampler:
-    """A robust Metropolis-Hastings sampler with adaptive step size."""
+    """A robust Metropolis-Hastings sampler with per-row adaptive step sizes."""
+
+    # Whether warmup may run the fused kernel
+    _fusable = True
+
+    # Per-row attributes, with their number of dimensions after the row one
+    _row_attrs: dict[str, int] = {
+        "current_state_": 1,
+        "current_log_prob_": 0,
+        "step_size_": 0,
+        "n_accepted_": 0,
+        "n_proposed_": 0,
+    }
 
     def __init__(
         self,
         log_prob_fn: Callable[[torch.Tensor], torch.Tensor],
         init_state: torch.Tensor,
-        init_step_size: float = 0.1,
+        init_step_size: float | torch.Tensor = 0.1,
         adapt_rate: float = 0.1,
         target_accept_rate: float = 0.234,
+        checker: NumericalChecker | None = None,
+        compile_kernel: bool = False,
     ):
         """Initialize the Metropolis-Hastings sampler kernel.
 
+        Every row of the state, that is every individual, gets its own step
+        size adapted from its own acceptance decisions.
+
         Args:
             log_prob_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes log probability.
             init_state (torch.Tensor): Starting state for the chain.
-            init_step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
+            init_step_size (float | torch.Tensor, optional): Kernel standard error in Metropolis Hastings, either shared or per row. Defaults to 0.1.
             adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
             target_accept_rate (float, optional): Mean acceptance target. Defaults to 0.234.
+            checker (NumericalChecker | None, optional): The numerical check policy of proposals, None for a strict one. Defaults to None.
+            compile_kernel (bool, optional): Whether to wrap the fused warmup kernel in torch.compile. The log probability goes through user functions and Python caches that graph break, so only the arithmetic around them is fused. Defaults to False.
 
         Raises:
             RuntimeError: If the initial log prob fails to be computed.
@@ -31,10 +54,18 @@ class MetropolisHastingsSampler:
         self.log_prob_fn = log_prob_fn
         self.adapt_rate = adapt_rate
         self.target_accept_rate = target_accept_rate
+        self.checker = checker if checker is not None else NumericalChecker()
+        self._kernel_fn = (
+            torch.compile(self._kernel) if compile_kernel else self._kernel
+        )
 
         # Initialize state
         self.current_state_ = init_state.clone().detach()
-        self.step_size_ = torch.tensor(init_step_size)
+        self.step_size_ = (
+            torch.as_tensor(init_step_size, dtype=self.current_state_.dtype)
+            .expand(self.current_state_.shape[:-1])
+            .clone()
+        )
 
         # Compute initial log probability
         try:
@@ -43,8 +74,10 @@ class MetropolisHastingsSampler:
             raise RuntimeError(f"Failed to compute initial log probability: {e}")
 
         # Statistics tracking
+        self.diagnostics_: ChainDiagnostics | None = None
         self.n_samples = 0
-        self.n_accepted = 0
+        self.n_accepted_ = torch.zeros_like(self.step_size_)
+        self.n_proposed_ = torch.zeros_like(self.step_size_)
 
         self._check()
 
@@ -61,7 +94,7 @@ class MetropolisHastingsSampler:
         if not callable(self.log_prob_fn):
             raise TypeError("log_prob_fn must be callable")
 
-        if self.step_size_ <= 0:
+        if (self.step_size_ <= 0).any():
             raise ValueError("step_size must be strictly positive")
 
         if not 0 < self.target_accept_rate < 1:
@@ -81,99 +114,800 @@ class MetropolisHastingsSampler:
         self.current_state_ = self.current_state_.detach()
         self.current_log_prob_ = self.current_log_prob_.detach()
 
-        # Generate proposal
-        noise = torch.randn_like(self.current_state_)
-        proposed_state = self.current_state_ + noise * self.step_size_
-
-        # Compute proposal log probability
+        # Generate proposal and compute its log probability
         try:
-            proposed_log_prob = self.log_prob_fn(proposed_state)
+            proposed_state, proposed_log_prob, log_ratio = self._propose()
         except Exception as e:
             warnings.warn(f"Failed to compute proposal log probability: {e}")
             return self.current_state_, self.current_log_prob_
 
         # Check for invalid log probabilities
-        if torch.isnan(proposed_log_prob).any() or torch.isinf(proposed_log_prob).any():
-            warnings.warn("Invalid log probability encountered in proposal")
+        if self.checker(
+            proposed_log_prob, "Invalid log probability encountered in proposal"
+        ):
             return self.current_state_, self.current_log_prob_
 
-        # Compute acceptance probability
-        log_prob_diff = proposed_log_prob - self.current_log_prob_
-
-        # Vectorized acceptance decision
-        log_uniform = torch.log(torch.clamp(torch.rand_like(log_prob_diff), min=1e-8))
-        accept_mask = log_uniform < log_prob_diff
+        # Vectorized acceptance decision, unchecked invalid rows are rejected
+        log_uniform = torch.log(torch.clamp(torch.rand_like(log_ratio), min=1e-8))
+        accept_mask = (log_uniform < log_ratio) & torch.isfinite(proposed_log_prob)
 
         # Update accepted states
-        if accept_mask.any():
-            self.current_state_ = torch.where(
-                (
-                    accept_mask.unsqueeze(-1)
-                    if accept_mask.dim() < self.current_state_.dim()
-                    else accept_mask
-                ),
-                proposed_state,
-                self.current_state_,
-            )
-            self.current_log_prob_ = torch.where(
-                accept_mask, proposed_log_prob, self.current_log_prob_
-            )
+        self._accept(accept_mask, proposed_state, proposed_log_prob)
 
         # Update statistics
         self.n_samples += 1
-        accepted = accept_mask.float().mean().item()
-        self.n_accepted += accepted
+        accepted = accept_mask.float()
+        self.n_accepted_ += accepted
+        self.n_proposed_ += 1
 
         # Adapt step size
         self._adapt_step_size(accepted)
+        self._record(self.current_state_)
 
         return self.current_state_, self.current_log_prob_
 
-    def warmup(self, warmup: int) -> None:
+    def _kernel(
+        self,
+        log_prob_fn: Callable[[torch.Tensor], torch.Tensor],
+        state: torch.Tensor,
+        log_prob: torch.Tensor,
+        step_size: torch.Tensor,
+        noise: torch.Tensor,
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Pure random walk Metropolis transition used by the fused warmup.
+
+        Invalid proposals are rejected row-wise instead of skipping the step,
+        so that no host synchronization is needed. The log probability
+        function is an argument rather than read from the sampler, so that
+        restricting the sampler to other rows does not invalidate the compiled
+        kernel.
+
+        Args:
+            log_prob_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes log probability.
+            state (torch.Tensor): The current state.
+            log_prob (torch.Tensor): The log probability of the current state.
+            step_size (torch.Tensor): The per-row step sizes.
+            noise (torch.Tensor): The unscaled proposal increments.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The new state, its log probability and the acceptance mask.
+        """
+
+        proposed_state = state + noise * step_size.unsqueeze(-1)
+        proposed_log_prob = log_prob_fn(proposed_state)
+
+        log_uniform = torch.log(torch.clamp(torch.rand_like(log_prob), min=1e-8))
+        accept_mask = (log_uniform < proposed_log_prob - log_prob) & torch.isfinite(
+            proposed_log_prob
+        )
+
+        return (
+            torch.where(accept_mask.unsqueeze(-1), proposed_state, state),
+            torch.where(accept_mask, proposed_log_prob, log_prob),
+            accept_mask,
+        )
+
+    def _propose(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Draws a proposal and computes its log acceptance ratio.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The proposed state, its log probability and the log acceptance ratio.
+        """
+
+        noise = self._proposal_noise()
+        proposed_state = self.current_state_ + noise * self.step_size_.unsqueeze(-1)
+        proposed_log_prob = self.log_prob_fn(proposed_state)
+
+        return (
+            proposed_state,
+            proposed_log_prob,
+            proposed_log_prob - self.current_log_prob_,
+        )
+
+    def _proposal_noise(self) -> torch.Tensor:
+        """Draws the unscaled proposal increments.
+
+        Returns:
+            torch.Tensor: Standard normal increments shaped as the state.
+        """
+
+        return torch.randn_like(self.current_state_)
+
+    def _record(self, state: torch.Tensor) -> None:
+        """Records the state after a step, for adaptive kernels.
+
+        Args:
+            state (torch.Tensor): The current state.
+        """
+
+    def _accept(
+        self,
+        accept_mask: torch.Tensor,
+        proposed_state: torch.Tensor,
+        proposed_log_prob: torch.Tensor,
+    ):
+        """Moves the accepted rows to their proposal.
+
+        Args:
+            accept_mask (torch.Tensor): The per-row acceptance decisions.
+            proposed_state (torch.Tensor): The proposed state.
+            proposed_log_prob (torch.Tensor): The log probability of the proposed state.
+        """
+
+        self.current_state_ = torch.where(
+            accept_mask.unsqueeze(-1), proposed_state, self.current_state_
+        )
+        self.current_log_prob_ = torch.where(
+            accept_mask, proposed_log_prob, self.current_log_prob_
+        )
+
+    def _refresh(self) -> None:
+        """Recomputes the cached log probability of the current state."""
+
+        with torch.no_grad():
+            self.current_log_prob_ = self.log_prob_fn(self.current_state_)
+
+    @contextmanager
+    def restrict(
+        self, rows: torch.Tensor, **fns: Callable[..., torch.Tensor]
+    ) -> Iterator[None]:
+        """Runs the kernel on a subset of rows only.
+
+        The per-row states and adaptation of the selected rows are swapped in
+        along with the functions of the subset, then written back on exit, so
+        that the other rows keep theirs. The cached log probabilities of the
+        selected rows are recomputed, as the target may have changed since
+        they were last selected.
+
+        Args:
+            rows (torch.Tensor): The indices of the selected rows.
+            **fns (Callable[..., torch.Tensor]): The functions of the subset, such as log_prob_fn.
+
+        Yields:
+            None: The sampler restricted to the rows.
+        """
+
+        full = {name: getattr(self, name).detach() for name in self._row_attrs}
+        saved_fns = {name: getattr(self, name) for name in fns}
+
+        def _index(n_after: int) -> tuple[object, ...]:
+            return (..., rows, *[slice(None)] * n_after)
+
+        for name, n_after in self._row_attrs.items():
+            setattr(self, name, full[name][_index(n_after)])
+        for name, fn in fns.items():
+            setattr(self, name, fn)
+
+        try:
+            self._refresh()
+            yield
+        finally:
+            # Write the selected rows back
+            for name, n_after in self._row_attrs.items():
+                full[name][_index(n_after)] = getattr(self, name).detach()
+                setattr(self, name, full[name])
+            for name, fn in saved_fns.items():
+                setattr(self, name, fn)
+
+    def warmup(
+        self,
+        warmup: int,
+        *,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+        window: int = 100,
+        quantile: float = 0.9,
+    ) -> None:
         """Warmups the MCMC.
 
+        If rhat_tol is given, split R-hat and effective sample sizes are
+        computed online over consecutive windows, and the warmup stops as soon
+        as a window passes, after at most warmup steps. Otherwise, kernels
+        that support it run the fused warmup.
+
         Args:
-            warmup (int): The number of warmup steps.
+            warmup (int): The maximum number of warmup steps.
+            rhat_tol (float | None, optional): The tolerance of the split R-hat quantile to stop the warmup early, None to always run all steps. Defaults to None.
+            min_ess (float, optional): The minimum of the complementary effective sample size quantile to stop the warmup early. Defaults to 0.0.
+            window (int, optional): The number of steps of a diagnostic window. Defaults to 100.
+            quantile (float, optional): The quantile of the diagnostics over individuals and components. Defaults to 0.9.
 
         Raises:
             ValueError: If the warmup steps is not positive.
+            ValueError: If rhat_tol is not None and is not greater than 1.
         """
 
         if warmup < 0:
             raise ValueError("Warmup must be a non-negative integer")
+        if rhat_tol is not None and rhat_tol <= 1:
+            raise ValueError("rhat_tol must be greater than 1")
+
+        if rhat_tol is None and self._fusable:
+            self._fused_warmup(warmup)
+            return
+
+        diagnostics = (
+            ChainDiagnostics(window, quantile) if rhat_tol is not None else None
+        )
 
         with torch.no_grad():
             for _ in range(warmup):
-                self.step()
+                state, _ = self.step()
+
+                if diagnostics is None or not diagnostics.update(state):
+                    continue
 
-    def _adapt_step_size(self, accept_rate: float):
-        """Adapt the step_size.
+                self.diagnostics_ = diagnostics
+                if diagnostics.converged(cast(float, rhat_tol), min_ess):
+                    break
+
+    def _fused_warmup(self, warmup: int) -> None:
+        """Runs warmup steps with the pure kernel and a single host sync.
+
+        Acceptance statistics stay on device and numerical checks are deferred
+        to the end of the block. As in step, a failed proposal is warned about
+        and skipped, keeping the current state.
 
         Args:
-            accept_rate (float): The adaptation rate.
+            warmup (int): The number of warmup steps.
         """
 
-        adaptation = (
-            torch.tensor(accept_rate - self.target_accept_rate) * self.adapt_rate
-        )
+        state = self.current_state_.detach()
+        log_prob = self.current_log_prob_.detach()
+        n_accepted = torch.zeros_like(self.n_accepted_)
+        n_steps = 0
+
+        with torch.no_grad(), self.checker.deferred():
+            for _ in range(warmup):
+                noise = self._proposal_noise()
+                try:
+                    state, log_prob, accept_mask = self._kernel_fn(
+                        self.log_prob_fn, state, log_prob, self.step_size_, noise
+                    )
+                except Exception as e:
+                    warnings.warn(f"Failed to compute proposal log probability: {e}")
+                    continue
+
+                n_steps += 1
+                accepted = accept_mask.to(n_accepted.dtype)
+                n_accepted += accepted
+                self._adapt_step_size(accepted)
+
+                self.current_state_ = state
+                self._record(state)
+
+        # Update statistics
+        self.current_log_prob_ = log_prob
+        self.n_samples += n_steps
+        self.n_accepted_ += n_accepted
+        self.n_proposed_ += n_steps
+
+    def _adapt_step_size(self, accepted: torch.Tensor):
+        """Adapt the per-row step sizes.
+
+        Args:
+            accepted (torch.Tensor): The per-row acceptance decisions as floats.
+        """
+
+        adaptation = (accepted - self.target_accept_rate) * self.adapt_rate
         self.step_size_ *= torch.exp(adaptation)
 
+    @property
+    def acceptance_rates(self) -> torch.Tensor:
+        """Gets the per-row acceptance rates.
+
+        Returns:
+            torch.Tensor: The per-row acceptance rates accross iterations.
+        """
+
+        return self.n_accepted_ / self.n_proposed_.clamp(min=1)
+
     @property
     def acceptance_rate(self) -> float:
         """Gets the acceptance_rate mean.
 
         Returns:
-            float: The mean of the acceptance_rate accross iterations.
+            float: The mean of the acceptance_rate accross iterations and rows.
         """
 
-        return self.n_accepted / max(self.n_samples, 1)
+        return self.acceptance_rates.mean().item()
 
     @property
     def step_size(self) -> float:
-        """Gets current step_size.
+        """Gets current mean step_size.
+
+        Returns:
+            float: The current step_size averaged over rows.
+        """
+
+        return self.step_size_.mean().item()
+
+
+class AdaptiveMetropolisSampler(MetropolisHastingsSampler):
+    """An adaptive Metropolis sampler with a running covariance per row.
+
+    Proposals are drawn as step_size * L z, where L is the Cholesky factor of
+    the running covariance of the row's own chain, as in Haario et al. (2001).
+    """
+
+    _row_attrs = {
+        **MetropolisHastingsSampler._row_attrs,
+        "n_cov_": 0,
+        "adapted_": 0,
+        "mean_": 1,
+        "m2_": 2,
+        "chol_": 2,
+    }
+
+    def __init__(
+        self,
+        log_prob_fn: Callable[[torch.Tensor], torch.Tensor],
+        init_state: torch.Tensor,
+        init_step_size: float | torch.Tensor = 0.1,
+        adapt_rate: float = 0.1,
+        target_accept_rate: float = 0.234,
+        checker: NumericalChecker | None = None,
+        compile_kernel: bool = False,
+        *,
+        adapt_start: int = 100,
+        update_every: int = 10,
+        jitter: float = 1e-6,
+    ):
+        """Initialize the adaptive Metropolis sampler kernel.
+
+        Until adapt_start steps have been recorded for a row, its proposals
+        are isotropic. Its step size is reset to 2.38 / sqrt(d), the optimal
+        scaling for Gaussian targets, when its first factor is installed, and
+        keeps adapting from there.
+
+        Args:
+            log_prob_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes log probability.
+            init_state (torch.Tensor): Starting state for the chain.
+            init_step_size (float | torch.Tensor, optional): Kernel standard error in Metropolis Hastings, either shared or per row. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            target_accept_rate (float, optional): Mean acceptance target. Defaults to 0.234.
+            checker (NumericalChecker | None, optional): The numerical check policy of proposals, None for a strict one. Defaults to None.
+            compile_kernel (bool, optional): Whether to wrap the fused warmup kernel in torch.compile. The log probability goes through user functions and Python caches that graph break, so only the arithmetic around them is fused. Defaults to False.
+            adapt_start (int, optional): The number of recorded steps before using the covariance. Defaults to 100.
+            update_every (int, optional): The number of steps between two Cholesky updates. Defaults to 10.
+            jitter (float, optional): The diagonal jitter added to the covariance. Defaults to 1e-6.
+
+        Raises:
+            ValueError: If adapt_start is not strictly greater than 1.
+            ValueError: If update_every is not strictly positive.
+            ValueError: If jitter is negative.
+        """
+
+        if adapt_start <= 1:
+            raise ValueError("adapt_start must be strictly greater than 1")
+        if update_every <= 0:
+            raise ValueError("update_every must be strictly positive")
+        if jitter < 0:
+            raise ValueError("jitter must be non-negative")
+
+        super().__init__(
+            log_prob_fn,
+            init_state,
+            init_step_size,
+            adapt_rate,
+            target_accept_rate,
+            checker,
+            compile_kernel,
+        )
+
+        self.adapt_start = adapt_start
+        self.update_every = update_every
+        self.jitter = jitter
+
+        # Running moments of every row, updated with Welford's algorithm
+        dim = self.current_state_.shape[-1]
+        self.n_cov_ = torch.zeros_like(self.step_size_)
+        self.adapted_ = torch.zeros_like(self.step_size_, dtype=torch.bool)
+        self.mean_ = self.current_state_.clone()
+        self.m2_ = self.current_state_.new_zeros((*self.current_state_.shape, dim))
+        self.eye_ = torch.eye(dim, dtype=self.current_state_.dtype)
+        self.chol_ = self.eye_.expand_as(self.m2_).clone()
+
+    def _record(self, state: torch.Tensor) -> None:
+        """Updates the running covariance with the state after a step.
+
+        Args:
+            state (torch.Tensor): The current state.
+        """
+
+        # Update running moments, counted per row as rows may be restricted
+        self.n_cov_ += 1
+        delta = state - self.mean_
+        self.mean_ += delta / self.n_cov_.unsqueeze(-1)
+        self.m2_ += delta.unsqueeze(-1) * (state - self.mean_).unsqueeze(-2)
+
+        # Schedule the updates on each row's own count
+        due = (self.n_cov_ >= self.adapt_start) & (
+            (self.n_cov_ - self.adapt_start) % self.update_every == 0
+        )
+        if due.any():
+            self._update_chol(due)
+
+    def _update_chol(self, due: torch.Tensor) -> None:
+        """Updates the batched Cholesky factors of the running covariances.
+
+        Rows whose covariance is not positive definite keep their factor. Rows
+        installing their first factor switch to the covariance proposal with
+        the Gaussian optimal scaling.
+
+        Args:
+            due (torch.Tensor): The mask of rows to update.
+        """
+
+        n_cov = self.n_cov_[..., None, None]
+        cov = self.m2_ / (n_cov - 1).clamp(min=1) + self.jitter * self.eye_
+        chol, info = torch.linalg.cholesky_ex(cov)
+
+        installed = due & (info == 0)
+        self.chol_ = torch.where(installed[..., None, None], chol, self.chol_)
+        self.step_size_ = torch.where(
+            installed & ~self.adapted_,
+            2.38 / self.current_state_.shape[-1] ** 0.5,
+            self.step_size_,
+        )
+        self.adapted_ = self.adapted_ | installed
+
+    def _proposal_noise(self) -> torch.Tensor:
+        """Draws the unscaled proposal increments.
+
+        Returns:
+            torch.Tensor: Increments with the running covariance once adapted.
+        """
+
+        noise = torch.randn_like(self.current_state_)
+
+        return (self.chol_ @ noise.unsqueeze(-1)).squeeze(-1)
+
+
+class LangevinSampler(MetropolisHastingsSampler):
+    """A Metropolis adjusted Langevin (MALA) sampler with per-row step sizes.
+
+    Proposals drift along the gradient of the log probability, obtained with
+    autograd, which is computed row-wise since rows are independent.
+    """
+
+    _fusable = False
+    _row_attrs = {**MetropolisHastingsSampler._row_attrs, "current_grad_": 1}
+
+    def __init__(
+        self,
+        log_prob_fn: Callable[[torch.Tensor], torch.Tensor],
+        init_state: torch.Tensor,
+        init_step_size: float | torch.Tensor = 0.1,
+        adapt_rate: float = 0.1,
+        target_accept_rate: float = 0.574,
+        checker: NumericalChecker | None = None,
+    ):
+        """Initialize the Langevin sampler kernel.
+
+        Args:
+            log_prob_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes log probability, differentiable with respect to the state.
+            init_state (torch.Tensor): Starting state for the chain.
+            init_step_size (float | torch.Tensor, optional): Kernel standard error of the Langevin noise, either shared or per row. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            target_accept_rate (float, optional): Mean acceptance target. Defaults to 0.574.
+            checker (NumericalChecker | None, optional): The numerical check policy of proposals, None for a strict one. Defaults to None.
+
+        Raises:
+            RuntimeError: If the initial log prob fails to be computed.
+        """
+
+        super().__init__(
+            log_prob_fn,
+            init_state,
+            init_step_size,
+            adapt_rate,
+            target_accept_rate,
+            checker,
+        )
+
+        # Compute initial gradient
+        try:
+            self.current_log_prob_, self.current_grad_ = self._log_prob_and_grad(
+                self.current_state_, keep_graph=False
+            )
+        except Exception as e:
+            raise RuntimeError(f"Failed to compute initial gradient: {e}")
+
+        self._proposed_grad: torch.Tensor | None = None
+
+    def _refresh(self) -> None:
+        """Recomputes the cached log probability and gradient of the current
+        state."""
+
+        self.current_log_prob_, self.current_grad_ = self._log_prob_and_grad(
+            self.current_state_, keep_graph=False
+        )
+
+    def _log_prob_and_grad(
+        self, state: torch.Tensor, *, keep_graph: bool
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Computes the log probability and its gradient with respect to the state.
+
+        Args:
+            state (torch.Tensor): The state.
+            keep_graph (bool): Whether to keep the graph of the log probability, for later backward passes with respect to the parameters.
 
         Returns:
-            float: The current step_size.
+            tuple[torch.Tensor, torch.Tensor]: The log probability and its detached gradient.
         """
 
-        return self.step_size_.item()
+        with torch.enable_grad():
+            state = state.detach().requires_grad_(True)
+            log_prob = self.log_prob_fn(state)
+            (grad,) = torch.autograd.grad(
+                log_prob.sum(), state, retain_graph=keep_graph
+            )
+
+        return (log_prob if keep_graph else log_prob.detach()), grad
+
+    def _propose(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Draws a Langevin proposal and computes its log acceptance ratio.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The proposed state, its log probability and the log acceptance ratio.
+        """
+
+        eps = self.step_size_.unsqueeze(-1)
+        noise = torch.randn_like(self.current_state_)
+
+        # Drift along the gradient
+        proposed_state = (
+            self.current_state_ + 0.5 * eps**2 * self.current_grad_ + eps * noise
+        )
+        proposed_log_prob, proposed_grad = self._log_prob_and_grad(
+            proposed_state, keep_graph=torch.is_grad_enabled()
+        )
+        self._proposed_grad = proposed_grad
+
+        # Asymmetric proposal correction
+        backward_noise = (
+            self.current_state_ - proposed_state - 0.5 * eps**2 * proposed_grad
+        ) / eps
+        log_ratio = (
+            proposed_log_prob.detach()
+            - self.current_log_prob_
+            + 0.5 * (noise.pow(2).sum(-1) - backward_noise.pow(2).sum(-1))
+        )
+
+        # Rows with invalid gradients are rejected
+        log_ratio = torch.where(
+            torch.isfinite(proposed_grad).all(-1), log_ratio, -torch.inf
+        )
+
+        return proposed_state, proposed_log_prob, log_ratio
+
+    def _accept(
+        self,
+        accept_mask: torch.Tensor,
+        proposed_state: torch.Tensor,
+        proposed_log_prob: torch.Tensor,
+    ):
+        """Moves the accepted rows to their proposal, with their gradient.
+
+        Args:
+            accept_mask (torch.Tensor): The per-row acceptance decisions.
+            proposed_state (torch.Tensor): The proposed state.
+            proposed_log_prob (torch.Tensor): The log probability of the proposed state.
+        """
+
+        super()._accept(accept_mask, proposed_state.detach(), proposed_log_prob)
+        self.current_grad_ = torch.where(
+            accept_mask.unsqueeze(-1), self._proposed_grad, self.current_grad_
+        )
+
+
+class HamiltonianSampler(LangevinSampler):
+    """A Hamiltonian Monte Carlo sampler with short leapfrog trajectories.
+
+    The mass matrix is the identity and every row integrates its own
+    trajectory with its own step size.
+    """
+
+    def __init__(
+        self,
+        log_prob_fn: Callable[[torch.Tensor], torch.Tensor],
+        init_state: torch.Tensor,
+        init_step_size: float | torch.Tensor = 0.1,
+        adapt_rate: float = 0.1,
+        target_accept_rate: float = 0.65,
+        checker: NumericalChecker | None = None,
+        *,
+        n_leapfrog: int = 5,
+    ):
+        """Initialize the Hamiltonian sampler kernel.
+
+        Args:
+            log_prob_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes log probability, differentiable with respect to the state.
+            init_state (torch.Tensor): Starting state for the chain.
+            init_step_size (float | torch.Tensor, optional): Leapfrog step size, either shared or per row. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            target_accept_rate (float, optional): Mean acceptance target. Defaults to 0.65.
+            checker (NumericalChecker | None, optional): The numerical check policy of proposals, None for a strict one. Defaults to None.
+            n_leapfrog (int, optional): The number of leapfrog steps per trajectory. Defaults to 5.
+
+        Raises:
+            ValueError: If n_leapfrog is not strictly positive.
+        """
+
+        if n_leapfrog <= 0:
+            raise ValueError("n_leapfrog must be strictly positive")
+
+        super().__init__(
+            log_prob_fn,
+            init_state,
+            init_step_size,
+            adapt_rate,
+            target_accept_rate,
+            checker,
+        )
+
+        self.n_leapfrog = n_leapfrog
+
+    def _propose(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Integrates a leapfrog trajectory and computes its log acceptance ratio.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The proposed state, its log probability and the log acceptance ratio.
+        """
+
+        eps = self.step_size_.unsqueeze(-1)
+        init_momentum = torch.randn_like(self.current_state_)
+
+        # Leapfrog integration, only the end point keeps its graph
+        state = self.current_state_
+        momentum = init_momentum + 0.5 * eps * self.current_grad_
+        for i in range(self.n_leapfrog):
+            state = state + eps * momentum
+            last = i == self.n_leapfrog - 1
+            log_prob, grad = self._log_prob_and_grad(
+                state, keep_graph=last and torch.is_grad_enabled()
+            )
+            momentum = momentum + (0.5 if last else 1.0) * eps * grad
+        self._proposed_grad = grad
+
+        # Hamiltonian difference
+        log_ratio = (
+            log_prob.detach()
+            - self.current_log_prob_
+            - 0.5 * (momentum.pow(2).sum(-1) - init_momentum.pow(2).sum(-1))
+        )
+
+        # Rows with invalid gradients are rejected
+        log_ratio = torch.where(torch.isfinite(grad).all(-1), log_ratio, -torch.inf)
+
+        return state, log_prob, log_ratio
+
+
+class DelayedAcceptanceSampler(MetropolisHastingsSampler):
+    """A two stage delayed acceptance random walk Metropolis sampler.
+
+    Proposals are first screened with a cheap part of the log probability, the
+    remaining expensive part being only computed for the rows that pass, as in
+    Christen and Fox (2005). The chain targets the same distribution.
+    """
+
+    _fusable = False
+    _row_attrs = {**MetropolisHastingsSampler._row_attrs, "current_screen_": 0}
+
+    def __init__(
+        self,
+        log_prob_fn: Callable[[torch.Tensor], torch.Tensor],
+        init_state: torch.Tensor,
+        init_step_size: float | torch.Tensor = 0.1,
+        adapt_rate: float = 0.1,
+        target_accept_rate: float = 0.234,
+        checker: NumericalChecker | None = None,
+        *,
+        screen_fn: Callable[[torch.Tensor], torch.Tensor],
+        residual_fn: Callable[[torch.Tensor, torch.Tensor], torch.Tensor],
+    ):
+        """Initialize the delayed acceptance sampler kernel.
+
+        Args:
+            log_prob_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes log probability.
+            init_state (torch.Tensor): Starting state for the chain.
+            init_step_size (float | torch.Tensor, optional): Kernel standard error in Metropolis Hastings, either shared or per row. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            target_accept_rate (float, optional): Mean acceptance target. Defaults to 0.234.
+            checker (NumericalChecker | None, optional): The numerical check policy of proposals, None for a strict one. Defaults to None.
+            screen_fn (Callable[[torch.Tensor], torch.Tensor]): Function that computes the cheap part of the log probability.
+            residual_fn (Callable[[torch.Tensor, torch.Tensor], torch.Tensor]): Function that computes the remaining part of the log probability on the rows of a boolean mask, zero elsewhere.
+
+        Raises:
+            TypeError: If screen_fn or residual_fn is not callable.
+            RuntimeError: If the initial log prob fails to be computed.
+        """
+
+        if not callable(screen_fn) or not callable(residual_fn):
+            raise TypeError("screen_fn and residual_fn must be callable")
+
+        super().__init__(
+            log_prob_fn,
+            init_state,
+            init_step_size,
+            adapt_rate,
+            target_accept_rate,
+            checker,
+        )
+
+        self.screen_fn = screen_fn
+        self.residual_fn = residual_fn
+
+        # Compute initial screening log probability
+        try:
+            self.current_screen_ = self.screen_fn(self.current_state_).detach()
+        except Exception as e:
+            raise RuntimeError(f"Failed to compute initial log probability: {e}")
+
+        self._proposed_screen: torch.Tensor | None = None
+
+    def _refresh(self) -> None:
+        """Recomputes the cached log probability and screening log probability
+        of the current state."""
+
+        super()._refresh()
+        with torch.no_grad():
+            self.current_screen_ = self.screen_fn(self.current_state_)
+
+    def _propose(self) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Screens a proposal, then computes the second stage log acceptance
+        ratio of the rows that passed.
+
+        Rows rejected at the first stage get a -inf ratio and keep their
+        current log probability, so that they do not count as invalid.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The proposed state, its log probability and the log acceptance ratio.
+        """
+
+        noise = self._proposal_noise()
+        proposed_state = self.current_state_ + noise * self.step_size_.unsqueeze(-1)
+
+        # First stage on the cheap terms
+        proposed_screen = self.screen_fn(proposed_state)
+        log_uniform = torch.log(
+            torch.clamp(torch.rand_like(self.current_screen_), min=1e-8)
+        )
+        passed = (
+            log_uniform < proposed_screen.detach() - self.current_screen_
+        ) & torch.isfinite(proposed_screen.detach())
+        self._proposed_screen = proposed_screen.detach()
+
+        # Second stage on the remaining terms of the passing rows only
+        proposed_residual = self.residual_fn(proposed_state, passed)
+        current_residual = self.current_log_prob_ - self.current_screen_
+
+        proposed_log_prob = torch.where(
+            passed, proposed_screen + proposed_residual, self.current_log_prob_
+        )
+        log_ratio = torch.where(
+            passed, proposed_residual.detach() - current_residual, -torch.inf
+        )
+
+        return proposed_state, proposed_log_prob, log_ratio
+
+    def _accept(
+        self,
+        accept_mask: torch.Tensor,
+        proposed_state: torch.Tensor,
+        proposed_log_prob: torch.Tensor,
+    ):
+        """Moves the accepted rows to their proposal, with their screening
+        log probability.
+
+        Args:
+            accept_mask (torch.Tensor): The per-row acceptance decisions.
+            proposed_state (torch.Tensor): The proposed state.
+            proposed_log_prob (torch.Tensor): The log probability of the proposed state.
+        """
+
+        super()._accept(accept_mask, proposed_state, proposed_log_prob)
+        self.current_screen_ = torch.where(
+            accept_mask, self._proposed_screen, self.current_screen_
+        )
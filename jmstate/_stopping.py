@@ -0,0 +1,189 @@
+from typing import cast
+
+import torch
+
+
+class ConvergenceMonitor:
+    """Two phase stopping rule of stochastic approximation.
+
+    The first phase keeps the learning rate constant until the iterates are
+    stationary, judged either on the norm of the smoothed gradient or on the
+    relative change of the mean parameters of consecutive windows. The second phase
+    decays the learning rate as in Robbins-Monro and Polyak-Ruppert averages
+    the iterates, until the relative change of the average over a window falls
+    under the tolerance.
+    """
+
+    def __init__(
+        self,
+        params: list[torch.Tensor],
+        optimizer: torch.optim.Optimizer,
+        *,
+        tol: float,
+        window: int = 100,
+        decay_rate: float = 0.6,
+        criterion: str = "grad",
+        smoothing: float = 0.1,
+        grad_tol: float | None = None,
+    ):
+        """Initialize the convergence monitor.
+
+        Args:
+            params (list[torch.Tensor]): The optimized parameters.
+            optimizer (torch.optim.Optimizer): The optimizer whose learning rates are decayed.
+            tol (float): The tolerance of the relative parameter changes.
+            window (int, optional): The number of iterations between two checks. Defaults to 100.
+            decay_rate (float, optional): The exponent of the learning rate decay, in (0.5, 1]. Defaults to 0.6.
+            criterion (str, optional): The stationarity criterion of the first phase, either "grad" for the norm of the smoothed gradient or "params" for the relative change of windowed means. Defaults to "grad".
+            smoothing (float, optional): The exponential smoothing weight of the gradient. Defaults to 0.1.
+            grad_tol (float | None, optional): The tolerance of the smoothed gradient norm, in the units of the objective, None to use tol. Defaults to None.
+
+        Raises:
+            ValueError: If tol is not strictly positive.
+            ValueError: If window is not strictly positive.
+            ValueError: If decay_rate is not in (0.5, 1].
+            ValueError: If criterion is not in ("grad", "params").
+            ValueError: If smoothing is not in (0, 1].
+            ValueError: If grad_tol is not None and is not strictly positive.
+        """
+
+        if tol <= 0:
+            raise ValueError("tol must be strictly positive")
+        if window <= 0:
+            raise ValueError("window must be strictly positive")
+        if not 0.5 < decay_rate <= 1:
+            raise ValueError("decay_rate must be in (0.5, 1]")
+        if criterion not in ("grad", "params"):
+            raise ValueError(
+                f"criterion should be either grad or params, got {criterion}"
+            )
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+        if grad_tol is not None and grad_tol <= 0:
+            raise ValueError("grad_tol must be strictly positive or None")
+
+        self.params = params
+        self.optimizer = optimizer
+        self.tol = tol
+        self.window = window
+        self.decay_rate = decay_rate
+        self.criterion = criterion
+        self.smoothing = smoothing
+        self.grad_tol = tol if grad_tol is None else grad_tol
+
+        self.base_lrs = [group["lr"] for group in optimizer.param_groups]
+
+        # Statistics tracking
+        self.decaying_ = False
+        self.n_iter_ = 0
+        self.n_decay_ = 0
+        self.grad_avg_: torch.Tensor | None = None
+        self.grad_norm_: float | None = None
+        self.window_sum_: torch.Tensor | None = None
+        self.ref_: torch.Tensor | None = None
+        self.avg_: torch.Tensor | None = None
+
+    def _flat(self) -> torch.Tensor:
+        """Gets the flattened parameters.
+
+        Returns:
+            torch.Tensor: The detached parameter vector.
+        """
+
+        return torch.cat([p.detach().flatten() for p in self.params])
+
+    def _rel_change(self, current: torch.Tensor) -> float:
+        """Computes the relative change from the reference and moves it.
+
+        Args:
+            current (torch.Tensor): The current vector.
+
+        Returns:
+            float: The relative change, inf without a reference.
+        """
+
+        ref, self.ref_ = self.ref_, current.clone()
+        if ref is None:
+            return float("inf")
+
+        return ((current - ref).norm() / (ref.norm() + 1e-8)).item()
+
+    def update(self) -> bool:
+        """Records an optimizer step.
+
+        Returns:
+            bool: True if the averaged iterates have converged.
+        """
+
+        self.n_iter_ += 1
+        flat = self._flat()
+
+        if not self.decaying_:
+            stationary = False
+
+            if self.criterion == "grad":
+                # Smooth the gradient itself, so that noise averages out
+                grad = torch.cat(
+                    [
+                        torch.zeros_like(p).flatten()
+                        if p.grad is None
+                        else p.grad.detach().flatten()
+                        for p in self.params
+                    ]
+                )
+                self.grad_avg_ = (
+                    grad
+                    if self.grad_avg_ is None
+                    else torch.lerp(self.grad_avg_, grad, self.smoothing)
+                )
+                self.grad_norm_ = self.grad_avg_.norm().item()
+                stationary = (
+                    self.n_iter_ >= self.window and self.grad_norm_ < self.grad_tol
+                )
+            else:
+                self.window_sum_ = (
+                    flat if self.window_sum_ is None else self.window_sum_ + flat
+                )
+                if self.n_iter_ % self.window == 0:
+                    stationary = self._rel_change(self.window_sum_) < self.tol
+                    self.window_sum_ = None
+
+            if stationary:
+                # Start the decay and averaging phase
+                self.decaying_ = True
+                self.avg_ = flat.clone()
+                self.ref_ = None
+
+            return False
+
+        # Robbins-Monro learning rate decay
+        self.n_decay_ += 1
+        decay = (1 + self.n_decay_) ** -self.decay_rate
+        for group, base_lr in zip(self.optimizer.param_groups, self.base_lrs):
+            group["lr"] = base_lr * decay
+
+        # Polyak-Ruppert averaging
+        avg = cast(torch.Tensor, self.avg_)
+        self.avg_ = avg + (flat - avg) / (self.n_decay_ + 1)
+
+        if self.n_decay_ % self.window:
+            return False
+
+        return self._rel_change(self.avg_) < self.tol
+
+    def write_average(self) -> None:
+        """Copies the averaged iterates back into the parameters, if any."""
+
+        if self.avg_ is None:
+            return
+
+        i = 0
+        with torch.no_grad():
+            for p in self.params:
+                n = p.numel()
+                p.copy_(self.avg_[i : i + n].view_as(p))
+                i += n
+
+        # Restore the initial learning rates
+        for group, base_lr in zip(self.optimizer.param_groups, self.base_lrs):
+            group["lr"] = base_lr
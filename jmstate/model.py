@@ -1,13 +1,24 @@
 import copy
 import warnings
 from collections import defaultdict
-from typing import Any, DefaultDict, Dict
+from queue import Empty
+from contextlib import nullcontext
+from typing import Any, Callable, DefaultDict, Dict, Iterator, cast
 
+import numpy as np
 import torch
 from tqdm import tqdm
 
+from ._checks import NumericalChecker
 from ._hazard import HazardMixin
-from ._sampler import MetropolisHastingsSampler
+from ._sampler import (
+    AdaptiveMetropolisSampler,
+    DelayedAcceptanceSampler,
+    HamiltonianSampler,
+    LangevinSampler,
+    MetropolisHastingsSampler,
+)
+from ._stopping import ConvergenceMonitor
 from .utils import *
 
 
@@ -28,6 +39,16 @@ class MultiStateJointModel(HazardMixin):
         pen: Callable[[ModelParams], torch.Tensor] | None = None,
         n_quad: int = 16,
         n_bissect: int = 16,
+        root_atol: float = 1e-6,
+        root_rtol: float = 1e-6,
+        quad_tol: float | None = None,
+        quad_max_depth: int = 8,
+        check: str = "strict",
+        check_every: int = 100,
+        kernel: str = "mh",
+        n_leapfrog: int = 5,
+        compile_kernel: bool = False,
+        mcmc_init: str = "zero",
     ):
         """Initializes the joint model based on the user defined design.
 
@@ -36,10 +57,26 @@ class MultiStateJointModel(HazardMixin):
             init_params (ModelParams): Initial values for the parameters.
             pen (Callable[[ModelParams], torch.Tensor] | None, optional): The penalization function. Defaults to None.
             n_quad (int, optional): The used numnber of points for Gauss-Legendre quadrature. Defaults to 16.
-            n_bissect (int, optional): The number of bissection steps used in transition sampling. Defaults to 16.
+            n_bissect (int, optional): The maximum number of safeguarded Newton steps used in transition sampling. Defaults to 16.
+            root_atol (float, optional): The absolute time tolerance of transition sampling. Defaults to 1e-6.
+            root_rtol (float, optional): The relative time tolerance of transition sampling. Defaults to 1e-6.
+            quad_tol (float | None, optional): The tolerance of the adaptive Gauss-Kronrod quadrature, relative for integrals above one and absolute otherwise, None to use the fixed Gauss-Legendre rule. Defaults to None.
+            quad_max_depth (int, optional): The maximum number of interval bisections in adaptive quadrature. Defaults to 8.
+            check (str, optional): The runtime numerical check policy, either "strict" to check and warn at every call, "sampled" to check every check_every calls without skipping values and summarize the issues at the end of fit or predict, or "off". Defaults to "strict".
+            check_every (int, optional): The number of calls between two checks of the same site with the "sampled" policy. Defaults to 100.
+            kernel (str, optional): The MCMC kernel of random effects, either "mh" for isotropic random walk Metropolis, "am" for adaptive Metropolis with a running covariance per individual, "mala" for Metropolis adjusted Langevin, "hmc" for Hamiltonian Monte Carlo or "da" for delayed acceptance random walk Metropolis, screening proposals with the longitudinal and prior terms before computing the hazard terms. Defaults to "mh".
+            n_leapfrog (int, optional): The number of leapfrog steps per trajectory of the "hmc" kernel. Defaults to 5.
+            compile_kernel (bool, optional): Whether to wrap the fused warmup kernel of the "mh" and "am" kernels in torch.compile, which graph breaks around the user functions and likelihood caches. Defaults to False.
+            mcmc_init (str, optional): The initialization of the random effects chains, either "zero" or "mode" to start from the posterior modes found by damped Newton, with step sizes scaled by the local curvature. Defaults to "zero".
 
         Raises:
             TypeError: If pen is not None and is not callable.
+            ValueError: If quad_tol is not None and is not strictly positive.
+            ValueError: If quad_max_depth is negative.
+            ValueError: If check is not in ("strict", "sampled", "off").
+            ValueError: If kernel is not in ("mh", "am", "mala", "hmc", "da").
+            ValueError: If n_leapfrog is not strictly positive.
+            ValueError: If mcmc_init is not in ("zero", "mode").
         """
 
         # Store model components
@@ -49,9 +86,10 @@ class MultiStateJointModel(HazardMixin):
         # Store penalization
         if pen is not None and not callable(pen):
             raise TypeError("pen must be callable or None")
-        self.pen: Callable[[ModelParams], torch.Tensor] = lambda params: (
-            torch.tensor(0.0, dtype=torch.float32) if pen is None else pen(params)
-        )
+        self._pen = pen
+
+        # Set up numerical checks
+        self._checker = NumericalChecker(check, check_every)
 
         # Set up numerical integration
         self.n_quad = n_quad
@@ -59,89 +97,325 @@ class MultiStateJointModel(HazardMixin):
         self._std_weights = None
         self._legendre_quad(self.n_quad)
 
-        # Set up for bissection algorithm
+        # Set up adaptive numerical integration
+        if quad_tol is not None and quad_tol <= 0:
+            raise ValueError("quad_tol must be strictly positive or None")
+        if quad_max_depth < 0:
+            raise ValueError("quad_max_depth must be a non-negative integer")
+        self.quad_tol = quad_tol
+        self.quad_max_depth = quad_max_depth
+        self._kronrod_nodes = None
+        self._kronrod_weights = None
+        self._gauss_weights = None
+        self._kronrod_quad()
+
+        # Hazard evaluations saved by adaptive quadrature over the fixed rule
+        self.quad_evals_saved_ = 0
+
+        # Set up for root finding algorithm
         self.n_bissect = n_bissect
+        self.root_atol = root_atol
+        self.root_rtol = root_rtol
+
+        # Set up MCMC kernel
+        if kernel not in ("mh", "am", "mala", "hmc", "da"):
+            raise ValueError(
+                f"kernel should be either mh, am, mala, hmc or da, got {kernel}"
+            )
+        if n_leapfrog <= 0:
+            raise ValueError("n_leapfrog must be strictly positive")
+        self.kernel = kernel
+        self.n_leapfrog = n_leapfrog
+        self.compile_kernel = compile_kernel
+
+        # Set up MCMC initialization
+        if mcmc_init not in ("zero", "mode"):
+            raise ValueError(
+                f"mcmc_init should be either zero or mode, got {mcmc_init}"
+            )
+        self.mcmc_init = mcmc_init
 
         # Initialize attributes that will be set during fitting
         self.sampler_: MetropolisHastingsSampler | None = None
         self.fim_: torch.Tensor | None = None
+        self.n_iter_fit_: int | None = None
         self.fit_ = False
 
-    def _hazard_ll(self, psi: torch.Tensor, data: ModelData) -> torch.Tensor:
+        # Hooks of distributed fitting
+        self._sync_grads: (
+            Callable[[list[torch.Tensor], torch.Tensor], torch.Tensor] | None
+        ) = None
+        self._progress = True
+        self._n_workers = 1
+
+    def pen(self, params: ModelParams) -> torch.Tensor:
+        """Computes the penalization, divided among the workers of a
+        distributed fit.
+
+        Args:
+            params (ModelParams): The parameters to penalize.
+
+        Returns:
+            torch.Tensor: The penalization, zero if none was given.
+        """
+
+        if self._pen is None:
+            return torch.tensor(0.0, dtype=torch.float32)
+
+        return self._pen(params) / self._n_workers
+
+    def _hazard_ll(
+        self,
+        psi: torch.Tensor,
+        data: ModelData,
+        mask: torch.Tensor | None = None,
+        rows: torch.Tensor | None = None,
+    ) -> torch.Tensor:
         """Computes the hazard log likelihood.
 
         Args:
-            psi (torch.Tensor): A matrix of individual parameters.
+            psi (torch.Tensor): A matrix of individual parameters, possibly with leading chain dimensions.
             data (ModelData): Dataset on which likelihood is computed.
+            mask (torch.Tensor | None, optional): A boolean mask with the leading dimensions of psi, restricting the computation to the selected rows, the others being zero. None to compute all rows. Defaults to None.
+            rows (torch.Tensor | None, optional): The individuals psi is given for, None for all of them. Defaults to None.
 
         Returns:
-            torch.Tensor: The computed log likelihood.
+            torch.Tensor: The computed log likelihood, with the leading dimensions of psi.
         """
 
-        ll = torch.zeros(data.size)
+        ll = torch.zeros(psi.shape[:-1])
+
+        # A subset of individuals is computed as masked rows
+        if rows is not None and mask is None:
+            mask = torch.ones(psi.shape[:-1], dtype=torch.bool)
+
+        # Masked rows are gathered as a flat matrix of parameters
+        flat_ll = ll.view(-1)
+        flat_psi = psi.reshape(-1, psi.shape[-1])
 
+        # Transitions with an exact cumulative hazard skip quadrature
         for key, bucket in data.buckets_.items():
+            closed_form = self.model_design.closed_form(key)
+            if closed_form is None:
+                continue
+
             alpha, beta = self.params_.alphas[key], self.params_.betas[key]
             idx, t0, t1, obs = bucket
 
-            obs_ll, alts_ll = self._log_and_cum_hazard(
-                t0,
-                t1,
-                data.x[idx],
-                psi[idx],
+            if mask is None:
+                psi_idx = psi[..., idx, :]
+                target, target_idx, shape = ll, idx, psi_idx.shape[:-1]
+                psi_flat, t0_flat, t1_flat, x_flat = self._flatten_chains(
+                    psi_idx,
+                    t0,
+                    t1,
+                    data.x[idx],
+                    cache=data.hazard_cache_,
+                    cache_key=("closed_form", key),
+                )
+            else:
+                entry, target_idx = self._masked_entries(idx, mask, data.size, rows)
+                target, shape, obs = flat_ll, entry.shape, obs[entry]
+                psi_flat, t0_flat, t1_flat, x_flat = (
+                    flat_psi[target_idx],
+                    t0[entry],
+                    t1[entry],
+                    data.x[idx[entry]],
+                )
+
+            obs_ll = self._log_hazard(
+                t0_flat.view(-1, 1),
+                t1_flat.view(-1, 1),
+                x_flat,
+                psi_flat,
                 alpha,
                 beta,
-                *self.model_design.surv[key],
-            )
+                *self.model_design.surv[key][:2],
+            ).view(shape)
+            alts_ll = closed_form.cum_hazard(
+                t0_flat, t1_flat, x_flat, psi_flat, alpha, beta
+            ).view(shape)
 
             # Check for invalid values
-            if obs_ll.isnan().any() or obs_ll.isinf().any():
-                warnings.warn(f"Invalid observed log likelihood for bucket {key}")
+            if self._checker(
+                obs_ll, f"Invalid observed log likelihood for bucket {key}"
+            ):
                 continue
 
-            if alts_ll.isnan().any() or alts_ll.isinf().any():
-                warnings.warn(f"Invalid cumulative hazard for bucket {key}")
+            if self._checker(alts_ll, f"Invalid cumulative hazard for bucket {key}"):
                 continue
 
             vals = obs * obs_ll - alts_ll
-            ll.scatter_add_(0, idx, vals)
+            target.scatter_add_(-1, target_idx.expand_as(vals), vals)
+
+        for group in data.groups_:
+            transitions = [
+                (
+                    self.params_.alphas[key],
+                    self.params_.betas[key],
+                    self.model_design.surv[key][0],
+                )
+                for key in group.keys
+            ]
+            group_obs = group.obs
+
+            if mask is not None:
+                # Only the selected rows are computed, without the cache
+                entry, target_idx = self._masked_entries(
+                    group.idx, mask, data.size, rows
+                )
+                target, group_obs = flat_ll, [obs[entry] for obs in group.obs]
+                results = self._log_and_cum_hazards(
+                    group.t0[entry],
+                    group.t1[entry],
+                    group.x[entry],
+                    flat_psi[target_idx],
+                    transitions,
+                    group.g,
+                )
+            elif self.quad_tol is None:
+                # Only psi has to be gathered on the precompiled grid
+                target, target_idx = ll, group.idx
+                results = self._log_and_cum_hazards_on_grid(
+                    group.t0,
+                    group.ts,
+                    group.hw,
+                    group.x,
+                    psi[..., group.idx, :],
+                    transitions,
+                    group.g,
+                    cache=data.hazard_cache_,
+                    cache_keys=group.keys,
+                )
+            else:
+                # Adaptive quadrature shares the link and cache of the group
+                target, target_idx = ll, group.idx
+                results = self._log_and_cum_hazards(
+                    group.t0,
+                    group.t1,
+                    group.x,
+                    psi[..., group.idx, :],
+                    transitions,
+                    group.g,
+                    cache=data.hazard_cache_,
+                    cache_keys=group.keys,
+                )
+
+            for key, obs, (obs_ll, alts_ll) in zip(group.keys, group_obs, results):
+                # Check for invalid values
+                if self._checker(
+                    obs_ll, f"Invalid observed log likelihood for bucket {key}"
+                ):
+                    continue
+
+                if self._checker(
+                    alts_ll, f"Invalid cumulative hazard for bucket {key}"
+                ):
+                    continue
+
+                vals = obs * obs_ll - alts_ll
+                target.scatter_add_(-1, target_idx.expand_as(vals), vals)
 
         return ll
 
-    def _long_ll(self, psi: torch.Tensor, data: ModelData) -> torch.Tensor:
+    @staticmethod
+    def _masked_entries(
+        idx: torch.Tensor,
+        mask: torch.Tensor,
+        size: int,
+        rows: torch.Tensor | None = None,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Selects the bucket entries of the masked rows.
+
+        Args:
+            idx (torch.Tensor): The individual index of each bucket entry.
+            mask (torch.Tensor): The boolean mask of rows, of shape (..., size) or (..., len(rows)).
+            size (int): The number of individuals.
+            rows (torch.Tensor | None, optional): The individuals the rows stand for, None for all of them. Defaults to None.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The selected entries and their flat row positions, chains included.
+        """
+
+        if rows is None:
+            chain, entry = mask.reshape(-1, size)[:, idx].nonzero(as_tuple=True)
+            return entry, chain * size + idx[entry]
+
+        # Remap individuals to their position among the rows
+        n_rows = rows.numel()
+        pos = torch.full((size,), -1, dtype=torch.long)
+        pos[rows] = torch.arange(n_rows)
+        local = pos[idx]
+
+        selected = (local >= 0) & mask.reshape(-1, n_rows)[:, local.clamp(min=0)]
+        chain, entry = selected.nonzero(as_tuple=True)
+
+        return entry, chain * n_rows + local[entry]
+
+    def _long_ll(
+        self,
+        psi: torch.Tensor,
+        data: ModelData,
+        rows: torch.Tensor | None = None,
+    ) -> torch.Tensor:
         """Computes the longitudinal log likelihood.
 
         Args:
-            psi (torch.Tensor): A matrix of individual parameters.
+            psi (torch.Tensor): A matrix of individual parameters, possibly with leading chain dimensions.
             data (ModelData): Dataset on which likelihood is computed.
+            rows (torch.Tensor | None, optional): The individuals psi is given for, None for all of them. Defaults to None.
 
         Returns:
-            torch.Tensor: The computed log likelihood.
+            torch.Tensor: The computed log likelihood, with the leading dimensions of psi.
         """
 
+        # Gather the individuals
+        x, t, y = data.x, data.valid_t_, data.valid_y_
+        valid_mask, n_valid = data.valid_mask_, data.n_valid_
+        if rows is not None:
+            x, y = x[rows], y[rows]
+            valid_mask, n_valid = valid_mask[rows], n_valid[rows]
+            if t.ndim > 1:
+                t = t[rows]
+
+        # Tile the design over the chains, as h expects a matrix of parameters,
+        # cached only for the full dataset whose rows are fixed
+        cache = data.hazard_cache_ if rows is None else None
+        if t.ndim == 1:
+            psi_flat, x_flat = self._flatten_chains(
+                psi, x, cache=cache, cache_key="long"
+            )
+            t_flat = t
+        else:
+            psi_flat, x_flat, t_flat = self._flatten_chains(
+                psi, x, t, cache=cache, cache_key="long"
+            )
+
         # Compute residuals: observed - predicted (only for valid observations)
-        predicted = self.model_design.h(data.valid_t_, data.x, psi)
-        diff = data.valid_y_ - predicted * data.valid_mask_
+        predicted = self.model_design.h(t_flat, x_flat, psi_flat).view(
+            *psi.shape[:-1], *y.shape[1:]
+        )
+        diff = y - predicted * valid_mask
 
         # Check for invalid predictions
-        if torch.isnan(predicted).any() or torch.isinf(predicted).any():
-            warnings.warn("Invalid predictions encountered in longitudinal model")
+        self._checker(
+            predicted, "Invalid predictions encountered in longitudinal model"
+        )
 
         # Reconstruct precision matrix R_inv from Cholesky parametrization and logdet
         R_inv, R_eigvals = self.params_.get_precision_and_log_eigvals("R")
 
         # Compute quadratic form: diff.T @ R_inv @ diff for each individual
-        R_quad_forms = torch.einsum("ijk,kl,ijl->i", diff, R_inv, diff)
+        R_quad_forms = torch.einsum("...ijk,kl,...ijl->...i", diff, R_inv, diff)
 
         # Compute total log det for each individual
-        R_log_dets = torch.einsum("ij,j->i", data.n_valid_, R_eigvals)
+        R_log_dets = torch.einsum("ij,j->i", n_valid, R_eigvals)
 
         # Log likelihood
         ll = 0.5 * (R_log_dets - R_quad_forms)
 
         # Validate output
-        if torch.isnan(ll).any() or torch.isinf(ll).any():
-            warnings.warn("Invalid longitudinal likelihood computed")
+        self._checker(ll, "Invalid longitudinal likelihood computed")
 
         return ll
 
@@ -149,20 +423,20 @@ class MultiStateJointModel(HazardMixin):
         """Computes the prior log likelihood.
 
         Args:
-            b (torch.Tensor): The individual random effects.
+            b (torch.Tensor): The individual random effects, possibly with leading chain dimensions.
 
         Raises:
             RuntimeError: If the computation fails.
 
         Returns:
-            torch.Tensor: The computed log likelihood.
+            torch.Tensor: The computed log likelihood, with the leading dimensions of b.
         """
 
         # Reconstruct precision matrix R_inv from Cholesky parametrization and logdet
         Q_inv, Q_eigvals = self.params_.get_precision_and_log_eigvals("Q")
 
         # Compute quadratic form: b.T @ Q_inv @ b for each individual
-        Q_quad_forms = torch.einsum("ik,kl,il->i", b, Q_inv, b)
+        Q_quad_forms = torch.einsum("...ik,kl,...il->...i", b, Q_inv, b)
 
         # Compute log det
         Q_log_det = Q_eigvals.sum()
@@ -171,43 +445,81 @@ class MultiStateJointModel(HazardMixin):
         ll = 0.5 * (Q_log_det - Q_quad_forms)
 
         # Validate output
-        if torch.isnan(ll).any() or torch.isinf(ll).any():
-            warnings.warn("Invalid prior likelihood computed")
+        self._checker(ll, "Invalid prior likelihood computed")
 
         return ll
 
-    def _ll(self, b: torch.Tensor, data: ModelData) -> torch.Tensor:
+    def _psi(self, b: torch.Tensor) -> torch.Tensor:
+        """Transforms random effects to individual-specific parameters.
+
+        Args:
+            b (torch.Tensor): The individual random effects, possibly with leading chain dimensions.
+
+        Returns:
+            torch.Tensor: The individual parameters, with the leading dimensions of b.
+        """
+
+        psi = self.model_design.f(self.params_.gamma, b.reshape(-1, b.shape[-1]))
+        psi = psi.view(*b.shape[:-1], psi.shape[-1])
+
+        # Validate transformation
+        self._checker(psi, "Invalid psi values from transformation")
+
+        return psi
+
+    def _ll(
+        self,
+        b: torch.Tensor,
+        data: ModelData,
+        rows: torch.Tensor | None = None,
+    ) -> torch.Tensor:
         """Computes the total log likelihood up to a constant.
 
         Args:
-            b (torch.Tensor): The individual random effects.
+            b (torch.Tensor): The individual random effects, possibly with leading chain dimensions.
             data (ModelData): Dataset on which the likeihood is computed.
+            rows (torch.Tensor | None, optional): The individuals b is given for, None for all of them. Defaults to None.
 
         Returns:
-            torch.Tensor: The computed total log likelihood.
+            torch.Tensor: The computed total log likelihood, with the leading dimensions of b.
         """
 
         # Transform random effects to individual-specific parameters
-        psi = self.model_design.f(self.params_.gamma, b)
-
-        # Validate transformation
-        if torch.isnan(psi).any() or torch.isinf(psi).any():
-            warnings.warn("Invalid psi values from transformation")
+        psi = self._psi(b)
 
         # Compute individual likelihood components
-        long_ll = self._long_ll(psi, data)
-        hazard_ll = self._hazard_ll(psi, data)
+        long_ll = self._long_ll(psi, data, rows)
+        hazard_ll = self._hazard_ll(psi, data, rows=rows)
         prior_ll = self._pr_ll(b)
 
         # Sum all likelihood components
         total_ll = long_ll + hazard_ll + prior_ll
 
         # Final validation
-        if torch.isnan(total_ll).any() or torch.isinf(total_ll).any():
-            warnings.warn("Invalid total likelihood computed")
+        self._checker(total_ll, "Invalid total likelihood computed")
 
         return total_ll
 
+    def _screen_ll(
+        self,
+        b: torch.Tensor,
+        data: ModelData,
+        rows: torch.Tensor | None = None,
+    ) -> torch.Tensor:
+        """Computes the cheap longitudinal and prior part of the log likelihood,
+        used to screen proposals in delayed acceptance.
+
+        Args:
+            b (torch.Tensor): The individual random effects, possibly with leading chain dimensions.
+            data (ModelData): Dataset on which the likeihood is computed.
+            rows (torch.Tensor | None, optional): The individuals b is given for, None for all of them. Defaults to None.
+
+        Returns:
+            torch.Tensor: The computed partial log likelihood, with the leading dimensions of b.
+        """
+
+        return self._long_ll(self._psi(b), data, rows) + self._pr_ll(b)
+
     def _build_vec_rep(
         self, trajectories: list[Traj], c: torch.Tensor
     ) -> dict[tuple[int, int], tuple[torch.Tensor, ...]]:
@@ -253,6 +565,7 @@ class MultiStateJointModel(HazardMixin):
                             f"Transition {(s0, s1)} must be in model_design.surv keys"
                         )
 
+                    # Buckets from the same origin share identical rows
                     for alt_state in alt_map.get(s0, []):
                         key = (s0, alt_state)
                         buckets[key][0].append(i)
@@ -276,50 +589,366 @@ class MultiStateJointModel(HazardMixin):
         except Exception as e:
             raise RuntimeError(f"Error building survival buckets: {e}") from e
 
+    def _compile_groups(self, data: ModelData) -> list[HazardGroup]:
+        """Precompiles the hazard groups of the buckets.
+
+        Transitions from the same origin state sharing the same link function
+        are grouped together, with their quadrature grids and gathered
+        covariates. Transitions with a closed form are left out.
+
+        Args:
+            data (ModelData): The dataset with its buckets.
+
+        Returns:
+            list[HazardGroup]: The precompiled hazard groups.
+        """
+
+        # Group transitions by origin state and link function
+        groups: DefaultDict[tuple[int, LinkFun], list[tuple[int, int]]]
+        groups = defaultdict(list)
+        for key in data.buckets_:
+            if self.model_design.closed_form(key) is None:
+                groups[(key[0], self.model_design.surv[key][1])].append(key)
+
+        compiled_groups: list[HazardGroup] = []
+
+        for (_, g), keys in groups.items():
+            # Transitions from the same origin share their sojourns
+            idx, t0, t1, _ = data.buckets_[keys[0]]
+            ts, hw = self._quad_grid(t0, t1)
+
+            compiled_groups.append(
+                HazardGroup(
+                    keys=keys,
+                    g=g,
+                    idx=idx,
+                    t0=t0.view(-1, 1),
+                    t1=t1.view(-1, 1),
+                    ts=ts,
+                    hw=hw,
+                    x=data.x[idx],
+                    obs=[data.buckets_[key][3] for key in keys],
+                )
+            )
+
+        return compiled_groups
+
     def _prepare_data(self, data: ModelData) -> None:
         """Add derived quantities.
 
+        The prepared quantities are memoized on the dataset, so that preparing
+        it again for the same design and quadrature is a no-op. The dataset
+        should then not be modified in place.
+
         Args:
             data (ModelData): The current dataset.
         """
 
+        # Skip if already prepared for this design and quadrature, the key holds
+        # the design itself so that it cannot be collected and its id reused
+        prepared_key = (
+            self.model_design,
+            tuple(self.model_design.surv.keys()),
+            self.n_quad,
+        )
+        if data.prepared_key_ == prepared_key:
+            return
+
         # Add derived quantities
         data.valid_mask_ = ~torch.isnan(data.y)
         data.n_valid_ = data.valid_mask_.sum(dim=1)
         data.valid_t_ = torch.nan_to_num(data.t)
         data.valid_y_ = torch.nan_to_num(data.y)
         data.buckets_ = self._build_vec_rep(data.trajectories, data.c)
+        data.groups_ = self._compile_groups(data)
+        data.hazard_cache_ = {}
+        data.prepared_key_ = prepared_key
+
+    def _ll_derivatives(
+        self, b: torch.Tensor, data: ModelData
+    ) -> tuple[torch.Tensor, torch.Tensor, torch.Tensor]:
+        """Computes the log likelihood with its gradient and Hessian with respect
+        to the random effects.
+
+        Since the log likelihood is separable by individual, the row-wise
+        Hessians are obtained with one backward pass per random effect.
+
+        Args:
+            b (torch.Tensor): The individual random effects.
+            data (ModelData): Dataset on which the likeihood is computed.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor, torch.Tensor]: The detached log likelihood, gradient and Hessian of each individual.
+        """
+
+        with torch.enable_grad():
+            b = b.detach().requires_grad_(True)
+            ll = self._ll(b, data)
+            (grad,) = torch.autograd.grad(ll.sum(), b, create_graph=True)
+
+            # One backward pass per random effect
+            q = b.shape[-1]
+            rows = [
+                torch.autograd.grad(grad[..., j].sum(), b, retain_graph=j < q - 1)
+                for j in range(q)
+            ]
+            hess = torch.stack([row[0] for row in rows], dim=-2)
+
+        # Symmetrize against round-off
+        hess = 0.5 * (hess + hess.mT)
+
+        return ll.detach(), grad.detach(), hess
+
+    def _find_modes(
+        self,
+        data: ModelData,
+        *,
+        init_b: torch.Tensor | None = None,
+        n_newton: int = 20,
+        n_halving: int = 10,
+        damping: float = 1e-4,
+        tol: float = 1e-4,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Finds the posterior mode of the random effects of every individual
+        with a batched damped Newton method.
+
+        Each step solves the damped Newton system of every individual at once,
+        falling back to a gradient step where the negative Hessian is not
+        positive definite, then halves the step of individuals whose log
+        likelihood did not increase. The parameters are not differentiated
+        through, so that no graph is built with respect to them.
+
+        Args:
+            data (ModelData): Dataset on which the likeihood is computed.
+            init_b (torch.Tensor | None, optional): The starting random effects, None to start at zero. Defaults to None.
+            n_newton (int, optional): The maximum number of Newton steps. Defaults to 20.
+            n_halving (int, optional): The maximum number of step halvings. Defaults to 10.
+            damping (float, optional): The diagonal damping of the negative Hessian. Defaults to 1e-4.
+            tol (float, optional): The gradient norm under which an individual has converged. Defaults to 1e-4.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The modes and the Cholesky factors of the damped negative Hessians at the modes.
+        """
+
+        b = (
+            torch.zeros((data.size, self.params_.Q_dim_))
+            if init_b is None
+            else init_b.detach()
+        )
+        eye = torch.eye(self.params_.Q_dim_)
+
+        # Only differentiate with respect to the random effects
+        requires_grad = self.params_.gamma.requires_grad
+        self.params_.require_grad(False)
+        try:
+            b, L = self._newton_modes(
+                data,
+                b,
+                eye,
+                n_newton=n_newton,
+                n_halving=n_halving,
+                damping=damping,
+                tol=tol,
+            )
+        finally:
+            self.params_.require_grad(requires_grad)
+
+        return b, L
+
+    def _newton_modes(
+        self,
+        data: ModelData,
+        b: torch.Tensor,
+        eye: torch.Tensor,
+        *,
+        n_newton: int,
+        n_halving: int,
+        damping: float,
+        tol: float,
+    ) -> tuple[torch.Tensor, torch.Tensor]:
+        """Runs the batched damped Newton iterations of _find_modes.
+
+        Args:
+            data (ModelData): Dataset on which the likeihood is computed.
+            b (torch.Tensor): The starting random effects.
+            eye (torch.Tensor): The identity matrix of the random effects dimension.
+            n_newton (int): The maximum number of Newton steps.
+            n_halving (int): The maximum number of step halvings.
+            damping (float): The diagonal damping of the negative Hessian.
+            tol (float): The gradient norm under which an individual has converged.
+
+        Returns:
+            tuple[torch.Tensor, torch.Tensor]: The modes and the Cholesky factors of the damped negative Hessians at the modes.
+        """
+
+        for i in range(n_newton + 1):
+            ll, grad, hess = self._ll_derivatives(b, data)
+            L, info = torch.linalg.cholesky_ex(-hess + damping * eye)
+
+            # Stop once every individual has converged
+            active = grad.norm(dim=-1) > tol
+            if i == n_newton or not active.any():
+                break
+
+            # Damped Newton direction, with a gradient fallback
+            newton = torch.cholesky_solve(grad.unsqueeze(-1), L).squeeze(-1)
+            fallback = grad / (1 + grad.norm(dim=-1, keepdim=True))
+            direction = torch.where((info == 0).unsqueeze(-1), newton, fallback)
+
+            # Backtracking on the individuals that did not improve
+            step = active.to(b.dtype)
+            with torch.no_grad():
+                for _ in range(n_halving):
+                    candidate = b + step.unsqueeze(-1) * direction
+                    improved = self._ll(candidate, data) >= ll
+                    if improved.all():
+                        break
+                    step = torch.where(improved, step, 0.5 * step)
+                step = torch.where(improved, step, torch.zeros_like(step))
+
+            b = b + step.unsqueeze(-1) * direction
+
+        # Make sure the curvature is positive definite
+        L = torch.where((info == 0)[..., None, None], L, eye.expand_as(L))
+
+        return b, L
 
     def _setup_mcmc(
         self,
         data: ModelData,
-        init_step_size: float = 0.1,
+        init_step_size: float | torch.Tensor = 0.1,
         adapt_rate: float = 0.1,
-        target_accept_rate: float = 0.234,
+        target_accept_rate: float | None = None,
+        n_chains: int = 1,
+        *,
+        disperse: bool = True,
     ) -> MetropolisHastingsSampler:
         """Setup the MCMC kernel and hyperparameters.
 
+        If mcmc_init is "mode", chains start from the posterior modes and
+        init_step_size is replaced by the curvature based step sizes.
+
         Args:
             data (ModelData): The dataset on which the likelihood is to be computed.
-            init_step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
+            init_step_size (float | torch.Tensor, optional): Kernel standard error in Metropolis Hastings, either shared or per individual. Defaults to 0.1.
             adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
-            target_accept_rate (float, optional): Mean acceptance target. Defaults to 0.234.
+            target_accept_rate (float | None, optional): Mean acceptance target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
+            n_chains (int, optional): The number of chains per individual. With more than one chain, the state has a leading chain dimension. Defaults to 1.
+            disperse (bool, optional): Whether several chains start from draws of the prior, or of the Laplace approximation if mcmc_init is "mode", rather than from the same point. Defaults to True.
+
+        Raises:
+            ValueError: If n_chains is not strictly positive.
 
         Returns:
             MetropolisHastingsSampler: The intialized Markov kernel.
         """
 
+        if n_chains <= 0:
+            raise ValueError("n_chains must be strictly positive")
+
+        q = self.params_.Q_dim_
+
         # Initialize random effects
-        init_b = torch.zeros((data.size, self.params_.Q_dim_))
+        if self.mcmc_init == "mode":
+            # Start at the posterior modes, scaled by the local curvature
+            mode, L = self._find_modes(data)
+            cov_diag = torch.cholesky_inverse(L).diagonal(dim1=-2, dim2=-1)
+            init_step_size = 2.38 * torch.sqrt(cov_diag.mean(dim=-1) / q)
+            init_b = mode
+        elif n_chains == 1 or not disperse:
+            init_b = torch.zeros((data.size, q))
+        else:
+            # Overdispersed starting points drawn from the prior
+            with torch.no_grad():
+                Q_inv, _ = self.params_.get_precision_and_log_eigvals("Q")
+                L = torch.linalg.cholesky(Q_inv).expand(data.size, q, q)
+                init_b = torch.zeros((data.size, q))
+
+        if n_chains > 1 and disperse:
+            # Dispersed draws around the starting points
+            z = torch.randn(n_chains, data.size, q, 1)
+            init_b = init_b + torch.linalg.solve_triangular(
+                L.mT, z, upper=True
+            ).squeeze(-1)
+        elif n_chains > 1:
+            init_b = init_b.expand(n_chains, -1, -1)
+
+        return self._make_sampler(
+            data, init_b, init_step_size, adapt_rate, target_accept_rate
+        )
 
-        # Create sampler
-        sampler = MetropolisHastingsSampler(
-            log_prob_fn=lambda b: self._ll(b, data),
+    def _sampler_fns(
+        self, data: ModelData, rows: torch.Tensor | None = None
+    ) -> Dict[str, Callable[..., torch.Tensor]]:
+        """Gets the log probability functions of the MCMC kernel.
+
+        Args:
+            data (ModelData): The dataset on which the likelihood is to be computed.
+            rows (torch.Tensor | None, optional): The individuals to restrict to, None for all of them. Defaults to None.
+
+        Returns:
+            Dict[str, Callable[..., torch.Tensor]]: The functions, by keyword argument of the kernel.
+        """
+
+        fns: Dict[str, Callable[..., torch.Tensor]] = dict(
+            log_prob_fn=lambda b: self._ll(b, data, rows)
+        )
+        if self.kernel == "da":
+            fns["screen_fn"] = lambda b: self._screen_ll(b, data, rows)
+            fns["residual_fn"] = lambda b, mask: self._hazard_ll(
+                self._psi(b), data, mask, rows
+            )
+
+        return fns
+
+    def _make_sampler(
+        self,
+        data: ModelData,
+        init_b: torch.Tensor,
+        init_step_size: float | torch.Tensor,
+        adapt_rate: float,
+        target_accept_rate: float | None,
+        rows: torch.Tensor | None = None,
+    ) -> MetropolisHastingsSampler:
+        """Creates the MCMC kernel of the model from a starting state.
+
+        Args:
+            data (ModelData): The dataset on which the likelihood is to be computed.
+            init_b (torch.Tensor): The starting random effects.
+            init_step_size (float | torch.Tensor): Kernel standard error in Metropolis Hastings, either shared or per individual.
+            adapt_rate (float): Adaptation rate for the step_size.
+            target_accept_rate (float | None): Mean acceptance target, None for the kernel default.
+            rows (torch.Tensor | None, optional): The individuals init_b is given for, None for all of them. Defaults to None.
+
+        Returns:
+            MetropolisHastingsSampler: The intialized Markov kernel.
+        """
+
+        kwargs: Dict[str, Any] = dict(
+            **self._sampler_fns(data, rows),
             init_state=init_b,
             init_step_size=init_step_size,
             adapt_rate=adapt_rate,
-            target_accept_rate=target_accept_rate,
+            checker=self._checker,
         )
+        if target_accept_rate is not None:
+            kwargs["target_accept_rate"] = target_accept_rate
+
+        match self.kernel:
+            case "am":
+                sampler = AdaptiveMetropolisSampler(
+                    **kwargs, compile_kernel=self.compile_kernel
+                )
+            case "mala":
+                sampler = LangevinSampler(**kwargs)
+            case "hmc":
+                sampler = HamiltonianSampler(**kwargs, n_leapfrog=self.n_leapfrog)
+            case "da":
+                sampler = DelayedAcceptanceSampler(**kwargs)
+            case _:
+                sampler = MetropolisHastingsSampler(
+                    **kwargs, compile_kernel=self.compile_kernel
+                )
 
         return sampler
 
@@ -334,147 +963,884 @@ class MultiStateJointModel(HazardMixin):
         callback: Callable[[], None] | None = None,
         step_size: float = 0.1,
         adapt_rate: float = 0.1,
-        accept_target: float = 0.234,
+        accept_target: float | None = None,
         init_warmup: int = 500,
         cont_warmup: int = 5,
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+        method: str = "mcmc",
+        n_nodes: int = 3,
+        minibatch_size: int | None = None,
+        schedule: Callable[[int], int] | None = None,
+        tol: float | None = None,
+        window: int = 100,
+        decay_rate: float = 0.6,
+        stop_criterion: str = "grad",
+        grad_tol: float | None = None,
     ) -> None:
         """Fits the MultiStateJointModel.
 
+        With method "mcmc", the random effects are sampled by MCMC and the
+        parameters follow a stochastic gradient. With method "aghq", the
+        marginal likelihood is integrated deterministically by adaptive
+        Gauss-Hermite quadrature, and the MCMC arguments are ignored.
+
+        In minibatch mode, only a random subset of individuals is sampled and
+        backpropagated at each iteration, with the gradient rescaled to stay
+        unbiased. A single sampler is restricted to the selected individuals,
+        so that every individual keeps its chains, step sizes and kernel
+        adaptation across iterations, which only move when it is selected.
+
+        If tol is given, the learning rate stays constant until the iterates
+        are stationary, then decays as in Robbins-Monro while the iterates are
+        averaged, and the fit stops once the average is stable. The averaged
+        parameters are then kept as the estimate.
+
         Args:
             data (ModelData): The dataset to learn from.
             optimizer (type[torch.optim.Optimizer], optional): The stochastic optimizer constructor. Defaults to torch.optim.Adam.
             optimizer_params (_type_, optional): Optimizer parameter dict. Defaults to {"lr": 1e-2}.
             n_iter (int, optional): Number of iterations for optimization. Defaults to 2000.
-            batch_size (int, optional): Batch size used in fitting. Defaults to 5.
+            batch_size (int, optional): Batch size used in fitting, the number of random effects draws per individual, run as chains. Defaults to 5.
             callback (Callable[[], None] | None, optional): A callback function that can be used to track the optimization. Defaults to None.
             step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
             adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
-            target_accept_rate (float, optional): Mean acceptation target. Defaults to 0.234.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
             init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
             cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
+            method (str, optional): The fitting method, either "mcmc" or "aghq". Defaults to "mcmc".
+            n_nodes (int, optional): The number of Gauss-Hermite nodes per random effect with method "aghq", 1 being the Laplace approximation. Defaults to 3.
+            minibatch_size (int | None, optional): The number of individuals per iteration, None to use all of them. Defaults to None.
+            schedule (Callable[[int], int] | None, optional): A function of the iteration giving the number of individuals of that iteration, overriding minibatch_size. Defaults to None.
+            tol (float | None, optional): The tolerance of the relative parameter changes of the stationarity and stopping criteria, None to run all n_iter iterations with a constant learning rate. Defaults to None.
+            window (int, optional): The number of iterations between two convergence checks. Defaults to 100.
+            decay_rate (float, optional): The exponent of the learning rate decay of the averaging phase, in (0.5, 1]. Defaults to 0.6.
+            stop_criterion (str, optional): The stationarity criterion, either "grad" for the norm of the smoothed gradient or "params" for the relative change of windowed mean parameters. Defaults to "grad".
+            grad_tol (float | None, optional): The tolerance of the smoothed gradient norm with stop_criterion "grad", in the units of the objective, None to use tol. Defaults to None.
+
+        Raises:
+            ValueError: If method is not in ("mcmc", "aghq").
+            ValueError: If minibatch_size is not None and is not strictly positive.
         """
 
-        # Load and complete data
-        x_rep = data.x.repeat(batch_size, 1)
-        t_rep = data.t if data.t.ndim == 1 else data.t.repeat(batch_size, 1)
-        y_rep = data.y.repeat(batch_size, 1, 1)
-        trajectories_rep = data.trajectories * batch_size
-        c_rep = data.c.repeat(batch_size)
+        if method not in ("mcmc", "aghq"):
+            raise ValueError(f"method should be either mcmc or aghq, got {method}")
+        if minibatch_size is not None and minibatch_size <= 0:
+            raise ValueError("minibatch_size must be strictly positive or None")
+
+        if method == "aghq":
+            # Warn about the sampling arguments that do not apply
+            ignored = [
+                name
+                for name, is_set in [
+                    ("batch_size", batch_size != 5),
+                    ("n_chains", n_chains != 1),
+                    ("minibatch_size", minibatch_size is not None),
+                    ("schedule", schedule is not None),
+                    ("tol", tol is not None),
+                    ("grad_tol", grad_tol is not None),
+                ]
+                if is_set
+            ]
+            if ignored:
+                warnings.warn(
+                    f"Arguments {', '.join(ignored)} are ignored with method aghq"
+                )
 
-        data_rep = ModelData(x_rep, t_rep, y_rep, trajectories_rep, c_rep)
+            self._fit_aghq(
+                data,
+                optimizer,
+                optimizer_params,
+                n_iter=n_iter,
+                callback=callback,
+                n_nodes=n_nodes,
+            )
+            return
 
-        self._prepare_data(data_rep)
+        # Load and complete data
+        self._prepare_data(data)
 
         # Set up optimizer
         self.params_.require_grad(True)
         params_list = self.params_.as_list
         optimizer_instance = optimizer(params=params_list, **optimizer_params)
 
-        # Set up MCMC
-        self.sampler_ = self._setup_mcmc(data_rep, step_size, adapt_rate, accept_target)
+        # Set up MCMC, the batch being run as extra chains
+        self.sampler_ = self._setup_mcmc(
+            data,
+            step_size,
+            adapt_rate,
+            accept_target,
+            batch_size * n_chains,
+            disperse=n_chains > 1,
+        )
 
         # Warmup MCMC
-        self.sampler_.warmup(init_warmup)
+        self.sampler_.warmup(init_warmup, rhat_tol=rhat_tol, min_ess=min_ess)
+
+        # Set up early stopping
+        monitor = (
+            ConvergenceMonitor(
+                params_list,
+                optimizer_instance,
+                tol=tol,
+                window=window,
+                decay_rate=decay_rate,
+                criterion=stop_criterion,
+                grad_tol=grad_tol,
+            )
+            if tol is not None
+            else None
+        )
+
+        minibatch = minibatch_size is not None or schedule is not None
 
         # Main fitting loop
-        for iteration in tqdm(range(n_iter), desc="Fitting joint model"):
+        for iteration in tqdm(
+            range(n_iter), desc="Fitting joint model", disable=not self._progress
+        ):
             try:
+                if minibatch:
+                    # Select the individuals of the iteration
+                    n_rows = (
+                        schedule(iteration)
+                        if schedule is not None
+                        else cast(int, minibatch_size)
+                    )
+                    n_rows = max(1, min(n_rows, data.size))
+                    rows = torch.randperm(data.size)[:n_rows]
+                    subset = self.sampler_.restrict(
+                        rows, **self._sampler_fns(data, rows)
+                    )
+                    scale = data.size / n_rows
+                else:
+                    subset = nullcontext()
+                    scale = 1.0
+
                 # MCMC: Sample random effects
-                self.sampler_.warmup(cont_warmup)
-                _, current_ll = self.sampler_.step()
+                with subset:
+                    self.sampler_.warmup(cont_warmup)
+                    _, current_ll = self.sampler_.step()
+
+                # Optimization step: Update parameters, unbiased in minibatch
+                optimizer_instance.zero_grad()
+                nll_pen = -current_ll.sum() * scale / (
+                    batch_size * n_chains
+                ) + self.pen(self.params_)
+                nll_pen.backward()  # type: ignore
+
+                # Reduce gradients across workers
+                if self._sync_grads is not None:
+                    self._sync_grads(params_list, nll_pen)
+
+                optimizer_instance.step()
+
+                # Execute callback
+                if callback is not None:
+                    callback()
+
+                # Check convergence
+                if monitor is not None and monitor.update():
+                    break
+
+            except Exception as e:
+                # A skipped iteration would desynchronize the workers
+                if self._sync_grads is not None:
+                    raise
+
+                warnings.warn(f"Error in iteration {iteration}: {e}")
+                continue
+
+        # Keep the averaged estimate
+        if monitor is not None:
+            monitor.write_average()
+        self.n_iter_fit_ = monitor.n_iter_ if monitor is not None else n_iter
+
+        # Summarize numerical issues
+        self._checker.summarize()
+
+        # Set fit_ to True
+        self.fit_ = True
+
+    def fit_distributed(
+        self,
+        data: ModelData,
+        *,
+        n_workers: int,
+        master_port: int = 29500,
+        seed: int = 0,
+        start_method: str = "fork",
+        timeout: float = 1.0,
+        **fit_kwargs: Any,
+    ) -> None:
+        """Fits the MultiStateJointModel with data parallel worker processes.
+
+        Individuals are split into n_workers contiguous shards. Every worker
+        process prepares its own shard and runs its own chains, and parameter
+        gradients are summed across workers at every iteration through
+        torch.distributed with the gloo backend. The penalization is divided
+        among the workers so that the summed objective matches a single
+        process fit. The fitted parameters of the first worker are copied back
+        into the model.
+
+        A failed iteration raises in its worker instead of being skipped, as
+        the other workers would otherwise wait for its gradients, and the
+        remaining workers are then terminated.
+
+        Workers are forked by default, so that user defined functions need not
+        be picklable. Forking is only safe while the intra-op thread pool of
+        torch has not been started in the parent process, that is before any
+        parallel tensor operation there; otherwise, use the "spawn" start
+        method, which requires the design functions and the penalization to
+        be picklable, such as module level functions, and a main module guard.
+        The sampler of a previous fit is not sent to the workers.
+
+        Args:
+            data (ModelData): The dataset to learn from.
+            n_workers (int): The number of worker processes.
+            master_port (int, optional): The local port of the process group rendezvous. Defaults to 29500.
+            seed (int, optional): The base seed of the workers, worker i using seed + i. Defaults to 0.
+            start_method (str, optional): The start method of the worker processes, either "fork" or "spawn". Defaults to "fork".
+            timeout (float, optional): The interval in seconds between two checks of the workers while waiting for the result. Defaults to 1.0.
+            **fit_kwargs (Any): The keyword arguments passed to fit, such as optimizer, n_iter or batch_size.
+
+        Raises:
+            ValueError: If n_workers is not strictly positive or exceeds the number of individuals.
+            ValueError: If start_method is not in ("fork", "spawn").
+            RuntimeError: If a worker fails.
+        """
+
+        if not 0 < n_workers <= data.size:
+            raise ValueError(
+                "n_workers must be strictly positive and at most the number of individuals"
+            )
+        if start_method not in ("fork", "spawn"):
+            raise ValueError(
+                f"start_method should be either fork or spawn, got {start_method}"
+            )
+
+        # Split individuals into contiguous shards
+        shards = [
+            ModelData(
+                data.x[idx],
+                data.t if data.t.ndim == 1 else data.t[idx],
+                data.y[idx],
+                [data.trajectories[i] for i in idx.tolist()],
+                data.c[idx],
+            )
+            for idx in torch.arange(data.size).tensor_split(n_workers)
+        ]
+
+        # Send the model without its sampler, which holds closures
+        worker_model = copy.copy(self)
+        worker_model.sampler_ = None
+
+        # Start the workers
+        ctx = torch.multiprocessing.get_context(start_method)
+        queue = ctx.Queue()
+        n_threads = max(1, torch.get_num_threads() // n_workers)
+        workers = [
+            ctx.Process(
+                target=_fit_worker,
+                args=(
+                    worker_model,
+                    rank,
+                    n_workers,
+                    shard,
+                    master_port,
+                    seed + rank,
+                    n_threads,
+                    fit_kwargs,
+                    queue,
+                ),
+            )
+            for rank, shard in enumerate(shards)
+        ]
+        for worker in workers:
+            worker.start()
+
+        # Collect the fitted parameters of the first worker, while checking
+        # that no worker died without reporting
+        result: Any = None
+        try:
+            while result is None:
+                try:
+                    result = queue.get(timeout=timeout)
+                except Empty:
+                    failed = [w.exitcode for w in workers if w.exitcode]
+                    if failed:
+                        result = RuntimeError(f"Worker exited with code {failed[0]}")
+        finally:
+            # Terminate the survivors of a failure
+            if isinstance(result, Exception) or result is None:
+                for worker in workers:
+                    if worker.is_alive():
+                        worker.terminate()
+            for worker in workers:
+                worker.join()
+
+        if isinstance(result, Exception) or any(w.exitcode for w in workers):
+            raise RuntimeError(f"Error in distributed fitting: {result}")
+
+        values, self.n_iter_fit_ = result
+        with torch.no_grad():
+            for p, value in zip(self.params_.as_list, values):
+                p.copy_(torch.as_tensor(value))
+
+        # Set fit_ to True
+        self.fit_ = True
+
+    def _aghq_log_marginals(
+        self, data: ModelData, mode: torch.Tensor, L: torch.Tensor, n_nodes: int
+    ) -> torch.Tensor:
+        """Computes the log marginal likelihoods by adaptive Gauss-Hermite
+        quadrature.
+
+        The tensor product nodes are centered at the modes and scaled by the
+        inverse Cholesky factors of the negative Hessians, then evaluated as
+        chains of the log likelihood. The modes and scales are held fixed, so
+        that the gradient is the exact gradient of the quadrature.
+
+        Args:
+            data (ModelData): Dataset on which the likeihood is computed.
+            mode (torch.Tensor): The modes of the random effects.
+            L (torch.Tensor): The Cholesky factors of the negative Hessians at the modes.
+            n_nodes (int): The number of nodes per random effect.
+
+        Returns:
+            torch.Tensor: The log marginal likelihood of each individual, up to a constant.
+        """
+
+        q = mode.shape[-1]
+
+        # Tensor product Gauss-Hermite rule
+        nodes_1d, weights_1d = cast(
+            tuple[
+                np.ndarray[Any, np.dtype[np.float64]],
+                np.ndarray[Any, np.dtype[np.float64]],
+            ],
+            np.polynomial.hermite.hermgauss(n_nodes),  #  type: ignore
+        )
+        nodes = torch.cartesian_prod(
+            *[torch.tensor(nodes_1d, dtype=torch.float32)] * q
+        ).view(-1, q)
+        log_weights = torch.cartesian_prod(
+            *[torch.tensor(np.log(weights_1d), dtype=torch.float32)] * q
+        ).view(-1, q)
+
+        # Adapt the nodes to every individual
+        shifts = torch.linalg.solve_triangular(
+            L.mT, nodes.T.expand(*L.shape[:-1], -1), upper=True
+        )
+        b = mode + (2**0.5) * shifts.permute(2, 0, 1)
+
+        # Evaluate the nodes as chains
+        ll = self._ll(b, data)
+        log_terms = log_weights.sum(dim=-1, keepdim=True) + nodes.pow(2).sum(
+            dim=-1, keepdim=True
+        )
+
+        return (
+            0.5 * q * torch.log(torch.tensor(2.0))
+            - torch.log(L.diagonal(dim1=-2, dim2=-1)).sum(dim=-1)
+            + torch.logsumexp(ll + log_terms, dim=0)
+        )
+
+    def _fit_aghq(
+        self,
+        data: ModelData,
+        optimizer: type[torch.optim.Optimizer],
+        optimizer_params: Dict[str, Any],
+        *,
+        n_iter: int,
+        callback: Callable[[], None] | None,
+        n_nodes: int,
+        n_newton: int = 5,
+        max_errors: int = 10,
+    ) -> None:
+        """Fits the MultiStateJointModel by adaptive Gauss-Hermite quadrature.
+
+        The modes are updated by a few warm started Newton steps before every
+        iteration, without differentiating through the parameters, and held
+        fixed within the iteration, so that the gradient is that of the
+        quadrature on the current nodes. The optimizer is given a closure so
+        that quasi-Newton methods such as torch.optim.LBFGS can be used. The
+        fit is aborted after max_errors consecutive failed iterations.
+
+        Args:
+            data (ModelData): The dataset to learn from.
+            optimizer (type[torch.optim.Optimizer]): The optimizer constructor.
+            optimizer_params (Dict[str, Any]): Optimizer parameter dict.
+            n_iter (int): Number of iterations for optimization.
+            callback (Callable[[], None] | None): A callback function that can be used to track the optimization.
+            n_nodes (int): The number of Gauss-Hermite nodes per random effect.
+            n_newton (int, optional): The number of Newton steps updating the modes at each iteration. Defaults to 5.
+            max_errors (int, optional): The number of consecutive failed iterations after which the fit is aborted. Defaults to 10.
+
+        Raises:
+            ValueError: If n_nodes is not strictly positive.
+            RuntimeError: If max_errors consecutive iterations failed.
+        """
+
+        if n_nodes <= 0:
+            raise ValueError("n_nodes must be strictly positive")
+
+        self._prepare_data(data)
+
+        # Set up optimizer
+        self.params_.require_grad(True)
+        params_list = self.params_.as_list
+        optimizer_instance = optimizer(params=params_list, **optimizer_params)
+
+        # Find the initial modes
+        mode, L = self._find_modes(data)
+        n_errors = 0
+
+        # Main fitting loop
+        for iteration in tqdm(
+            range(n_iter), desc="Fitting joint model", disable=not self._progress
+        ):
+            try:
+                # Update the modes and scales to the current parameters
+                mode, L = self._find_modes(data, init_b=mode, n_newton=n_newton)
+
+                def closure() -> torch.Tensor:
+                    optimizer_instance.zero_grad()
+                    nll_pen = -self._aghq_log_marginals(
+                        data, mode, L, n_nodes
+                    ).sum() + self.pen(self.params_)
+                    nll_pen.backward()  # type: ignore
+
+                    # Reduce gradients and loss across workers
+                    if self._sync_grads is not None:
+                        return self._sync_grads(params_list, nll_pen)
+
+                    return nll_pen
+
+                # Optimization step: Update parameters
+                optimizer_instance.step(closure)
+
+                # Execute callback
+                if callback is not None:
+                    callback()
+
+                n_errors = 0
+
+            except Exception as e:
+                # A skipped iteration would desynchronize the workers
+                if self._sync_grads is not None:
+                    raise
+
+                n_errors += 1
+                if n_errors >= max_errors:
+                    raise RuntimeError(
+                        f"Fit aborted after {n_errors} consecutive failed iterations: {e}"
+                    ) from e
+                warnings.warn(f"Error in iteration {iteration}: {e}")
+                continue
+
+        self.n_iter_fit_ = n_iter
+
+        # Summarize numerical issues
+        self._checker.summarize()
+
+        # Set fit_ to True
+        self.fit_ = True
+
+    @staticmethod
+    def _flatten_grads(
+        grads: tuple[torch.Tensor | None, ...], params_list: list[torch.Tensor]
+    ) -> torch.Tensor:
+        """Flattens parameter gradients, unused parameters getting zeros.
+
+        Args:
+            grads (tuple[torch.Tensor | None, ...]): The gradients, in the order of params_list.
+            params_list (list[torch.Tensor]): The parameters.
+
+        Returns:
+            torch.Tensor: The flat gradient, of shape (d,).
+        """
+
+        return torch.cat(
+            [
+                torch.zeros(p.numel()) if g is None else g.reshape(-1)
+                for p, g in zip(params_list, grads)
+            ]
+        )
+
+    @classmethod
+    def _individual_scores(
+        cls, ll: torch.Tensor, params_list: list[torch.Tensor], chunk_size: int
+    ) -> torch.Tensor:
+        """Computes the gradient of every entry of ll.
+
+        The gradient of the weighted sum of ll is differentiated again with
+        respect to the weights along every parameter direction, so that the
+        cost grows with the number of parameters and not with the number of
+        individuals. Directions are batched in vmapped backward passes.
+
+        Args:
+            ll (torch.Tensor): The individual log likelihoods, of shape (n,).
+            params_list (list[torch.Tensor]): The parameters to differentiate.
+            chunk_size (int): The number of parameter directions per batched backward pass.
+
+        Returns:
+            torch.Tensor: The individual scores, of shape (n, d).
+        """
+
+        # Weights whose gradients are the scores of every individual along a direction
+        weights = torch.ones_like(ll, requires_grad=True)
+        flat_grad = cls._flatten_grads(
+            torch.autograd.grad(
+                (weights * ll).sum(),
+                params_list,
+                create_graph=True,
+                allow_unused=True,
+            ),
+            params_list,
+        )
+        n, d = ll.numel(), flat_grad.numel()
+        if not flat_grad.requires_grad:
+            return torch.zeros(n, d)
+
+        eye = torch.eye(d, dtype=flat_grad.dtype)
+        columns: list[torch.Tensor] = []
+
+        for start in range(0, d, chunk_size):
+            basis = eye[start : start + chunk_size]
+
+            try:
+                # One vmapped backward pass for the whole chunk
+                (cols,) = torch.autograd.grad(
+                    flat_grad,
+                    weights,
+                    grad_outputs=basis,
+                    retain_graph=True,
+                    is_grads_batched=True,
+                )
+            except RuntimeError:
+                # Some operations have no batching rule, fall back to a loop
+                cols = torch.stack(
+                    [
+                        torch.autograd.grad(
+                            flat_grad, weights, grad_outputs=v, retain_graph=True
+                        )[0]
+                        for v in basis
+                    ]
+                )
+
+            columns.append(cols.reshape(-1, n))
+
+        return torch.cat(columns).T
+
+    def _pen_hvp(self) -> Callable[[torch.Tensor], torch.Tensor] | None:
+        """Builds the Hessian vector product of the penalization.
+
+        Returns:
+            Callable[[torch.Tensor], torch.Tensor] | None: The product, None if the penalization has no curvature.
+        """
+
+        params_list = self.params_.as_list
+        pen = self.pen(self.params_)
+        if not pen.requires_grad:
+            return None
+
+        pen_grad = self._flatten_grads(
+            torch.autograd.grad(pen, params_list, create_graph=True, allow_unused=True),
+            params_list,
+        )
+        if not pen_grad.requires_grad:
+            return None
+
+        def hvp(v: torch.Tensor) -> torch.Tensor:
+            return self._flatten_grads(
+                torch.autograd.grad(
+                    pen_grad @ v, params_list, retain_graph=True, allow_unused=True
+                ),
+                params_list,
+            )
+
+        return hvp
+
+    def _iter_posterior(
+        self,
+        data: ModelData,
+        n_draws: int,
+        *,
+        step_size: float,
+        adapt_rate: float,
+        accept_target: float | None,
+        init_warmup: int,
+        cont_warmup: int,
+        n_chains: int,
+        rhat_tol: float | None,
+        min_ess: float,
+        desc: str,
+    ) -> Iterator[torch.Tensor]:
+        """Yields posterior draws of the random effects at the current parameters.
+
+        Args:
+            data (ModelData): The dataset the posterior is conditioned on.
+            n_draws (int): The number of draws.
+            step_size (float): Kernel standard error in Metropolis Hastings.
+            adapt_rate (float): Adaptation rate for the step_size.
+            accept_target (float | None): Mean acceptation target, None for the kernel default.
+            init_warmup (int): The number of iteration steps used in the warmup.
+            cont_warmup (int): The warmup step in-between each draw.
+            n_chains (int): The number of MCMC chains per individual.
+            rhat_tol (float | None): The split R-hat tolerance under which the initial warmup stops early.
+            min_ess (float): The minimum effective sample size under which the initial warmup does not stop early.
+            desc (str): The progress bar description.
+
+        Yields:
+            torch.Tensor: The detached draws, of shape (n, q) or (n_chains, n, q).
+        """
+
+        # Set up MCMC for prediction
+        sampler = self._setup_mcmc(data, step_size, adapt_rate, accept_target, n_chains)
+
+        # Warmup MCMC
+        sampler.warmup(init_warmup, rhat_tol=rhat_tol, min_ess=min_ess)
+
+        for _ in tqdm(range(n_draws), desc=desc, disable=not self._progress):
+            # Sample random effects
+            sampler.warmup(cont_warmup)
+            with torch.no_grad():
+                current_b, _ = sampler.step()
+
+            yield current_b.detach()
+
+    def _louis_operator(
+        self, data: ModelData, draws: torch.Tensor, penalized: bool
+    ) -> Callable[[torch.Tensor], torch.Tensor]:
+        """Builds the observed information as a matrix free operator.
+
+        By Louis' identity, the observed information is the posterior mean of
+        the complete information minus the posterior covariance of the complete
+        scores, summed over individuals. Both terms are applied to a vector
+        through a double backward pass on a graph built once for all draws.
+
+        Args:
+            data (ModelData): The dataset the posterior is conditioned on.
+            draws (torch.Tensor): The posterior draws, of shape (M, n, q).
+            penalized (bool): Whether to add the Hessian of the penalization.
+
+        Returns:
+            Callable[[torch.Tensor], torch.Tensor]: The observed information vector product.
+        """
+
+        params_list = self.params_.as_list
+        n_draws = draws.shape[0]
+        pen_hvp = self._pen_hvp() if penalized else None
+
+        def _flat(grads: tuple[torch.Tensor | None, ...]) -> torch.Tensor:
+            return self._flatten_grads(grads, params_list)
+
+        # Weights whose gradients are the scores of every draw along a direction
+        weights = torch.ones(draws.shape[:2], requires_grad=True)
+        ll = self._ll(draws, data)
+        mean_score = _flat(
+            torch.autograd.grad(
+                (weights * ll).sum() / n_draws,
+                params_list,
+                create_graph=True,
+                allow_unused=True,
+            )
+        )
 
-                # Optimization step: Update parameters
-                optimizer_instance.zero_grad()
-                nll_pen = -current_ll.sum() / batch_size + self.pen(self.params_)
-                nll_pen.backward()  # type: ignore
+        def matvec(v: torch.Tensor) -> torch.Tensor:
+            *hv, dv = torch.autograd.grad(
+                mean_score @ v,
+                params_list + [weights],
+                retain_graph=True,
+                allow_unused=True,
+            )
 
-                optimizer_instance.step()
+            # Directional scores of every draw, centered per individual
+            dv = torch.zeros_like(ll) if dv is None else dv * n_draws
+            c = dv - dv.mean(dim=0)
+
+            # Posterior covariance of the complete scores times v
+            cov_v = _flat(
+                torch.autograd.grad(
+                    (c * ll).sum() / n_draws,
+                    params_list,
+                    retain_graph=True,
+                    allow_unused=True,
+                )
+            )
 
-                # Execute callback
-                if callback is not None:
-                    callback()
+            info_v = -_flat(tuple(hv)) - cov_v
 
-            except Exception as e:
-                warnings.warn(f"Error in iteration {iteration}: {e}")
-                continue
+            return info_v if pen_hvp is None else info_v + pen_hvp(v)
 
-        # Set fit_ to True
-        self.fit_ = True
+        return matvec
 
-    def _compute_fim(
+    def compute_fim(
         self,
         data: ModelData,
         *,
-        n_iter_fim: int = 500,
+        method: str = "scores",
+        n_iter_fim: int = 50,
         step_size: float = 0.1,
         adapt_rate: float = 0.1,
-        accept_target: float = 0.234,
+        accept_target: float | None = None,
         init_warmup: int = 500,
         cont_warmup: int = 5,
-    ) -> None:
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+        chunk_size: int = 256,
+        penalized: bool = True,
+    ) -> torch.Tensor | None:
         """Computes the Fisher Information Matrix.
 
+        With method "scores", the score of every individual is, by Fisher's
+        identity, the posterior mean of the gradient of its complete log
+        likelihood, estimated over the draws and chains. The empirical
+        information is then the sum over individuals of the outer products of
+        the centered scores, so that a few draws suffice where the aggregate
+        score needs many. With method "louis", the observed information is
+        built column by column from Hessian vector products, see
+        compute_stderror to avoid the full matrix.
+
+        The penalization is not separable over individuals, so its Hessian is
+        added to the information if penalized is True, giving the information
+        of the penalized objective that fit minimizes.
+
         Args:
             data (ModelData): The dataset to learn from. Should be the same as used in fit.
-            n_iter_fim (int, optional): Number of iterations to compute n_iter_fim. Defaults to 500.
+            method (str, optional): Either "scores" for the empirical information or "louis" for the observed information. Defaults to "scores".
+            n_iter_fim (int, optional): The number of posterior draws the information is averaged over. Defaults to 50.
             step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
             adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
-            target_accept_rate (float, optional): Mean acceptation target. Defaults to 0.234.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
             init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
             cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
+            chunk_size (int, optional): The number of parameter directions per batched backward pass with method "scores". Defaults to 256.
+            penalized (bool, optional): Whether to add the Hessian of the penalization. Defaults to True.
 
         Raises:
-            ValueError: If self.sampler_ is None.
+            ValueError: If method is not in ("scores", "louis").
+            ValueError: If n_iter_fim is not strictly positive.
+            ValueError: If chunk_size is not strictly positive.
+
+        Returns:
+            torch.Tensor | None: The Fisher Information Matrix, also stored in fim_, None if it could not be computed.
         """
 
+        if method not in ("scores", "louis"):
+            raise ValueError(f"method should be either scores or louis, got {method}")
+        if n_iter_fim <= 0:
+            raise ValueError("n_iter_fim must be strictly positive")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be strictly positive")
+
         if not self.fit_:
             warnings.warn(
                 "Model should be fit before computing Fisher Information Matrix"
             )
 
-        # Set up MCMC for prediction
-        sampler = self._setup_mcmc(data, step_size, adapt_rate, accept_target)
-
-        # Warmup MCMC
-        sampler.warmup(init_warmup)
+        # Load and complete data
+        self._prepare_data(data)
 
         # Setup
         self.params_.require_grad(True)
         params_list = self.params_.as_list
         d = self.params_.numel
-        self.fim_ = torch.zeros(d, d)
+        draws = self._iter_posterior(
+            data,
+            n_iter_fim,
+            step_size=step_size,
+            adapt_rate=adapt_rate,
+            accept_target=accept_target,
+            init_warmup=init_warmup,
+            cont_warmup=cont_warmup,
+            n_chains=n_chains,
+            rhat_tol=rhat_tol,
+            min_ess=min_ess,
+            desc="Computing Fisher Information Matrix",
+        )
 
-        for _ in tqdm(range(n_iter_fim), desc="Computing Fisher Information Matrix"):
-            # Sample random effects
-            sampler.warmup(cont_warmup)
-            _, current_ll = sampler.step()
-            nll_pen = -current_ll.sum() + self.pen(self.params_)
-
-            # Clear gradients
-            for p in params_list:
-                if p.grad is not None:
-                    p.grad.zero_()
-
-            # Compute gradients
-            nll_pen.backward()  # type: ignore
-
-            # Collect gradient vector
-            grad_chunks: list[torch.Tensor] = []
-            for p in params_list:
-                if p.grad is not None:
-                    grad_chunks.append(p.grad.view(-1))
-                else:
-                    grad_chunks.append(torch.zeros(p.numel()))
+        if method == "louis":
+            # Observed information from one Hessian vector product per column
+            q = self.params_.Q_dim_
+            matvec = self._louis_operator(
+                data, torch.cat([b.view(-1, data.size, q) for b in draws]), penalized
+            )
+            fim = torch.stack([matvec(e) for e in torch.eye(d)])
+            self.fim_ = (fim + fim.T) / 2
 
-            grad = torch.cat(grad_chunks)
+        else:
+            scores = torch.zeros(data.size, d)
 
-            # Update Fisher Information Matrix
-            self.fim_ += torch.outer(grad, grad) / n_iter_fim
+            for current_b in draws:
+                # Average the complete log likelihood over chains per individual
+                ll = self._ll(current_b, data).view(-1, data.size).mean(dim=0)
+
+                # Monte Carlo estimate of the individual scores
+                scores += (
+                    self._individual_scores(ll, params_list, chunk_size) / n_iter_fim
+                )
+
+            # Empirical information from the centered individual scores
+            total = scores.sum(dim=0)
+            self.fim_ = scores.T @ scores - torch.outer(total, total) / data.size
+
+            # Curvature of the penalization
+            pen_hvp = self._pen_hvp() if penalized else None
+            if pen_hvp is not None:
+                self.fim_ += torch.stack([pen_hvp(e) for e in torch.eye(d)])
+
+        # Summarize numerical issues
+        self._checker.summarize()
 
         if torch.isnan(self.fim_).any() or torch.isinf(self.fim_).any():
             warnings.warn("Error computing Fisher Information Matrix")
             self.fim_ = None
 
+        return self.fim_
+
+    def _unflatten_params(self, flat: torch.Tensor) -> ModelParams:
+        """Organizes a flat vector in the structure of the parameters.
+
+        Args:
+            flat (torch.Tensor): The flat vector, in the order of params_.as_list.
+
+        Returns:
+            ModelParams: The vector in the same format as the parameters.
+        """
+
+        i = 0
+
+        def _next(ref: torch.Tensor) -> torch.Tensor:
+            nonlocal i
+            n = ref.numel()
+            result = flat[i : i + n].view(ref.shape)
+            i += n
+            return result
+
+        gamma = _next(self.params_.gamma)
+
+        Q_flat = _next(self.params_.Q_repr[0])
+        Q_method = self.params_.Q_repr[1]
+
+        R_flat = _next(self.params_.R_repr[0])
+        R_method = self.params_.R_repr[1]
+
+        alphas = {key: _next(val) for key, val in self.params_.alphas.items()}
+
+        betas = {key: _next(val) for key, val in self.params_.betas.items()}
+
+        return ModelParams(gamma, (Q_flat, Q_method), (R_flat, R_method), alphas, betas)
+
     def get_stderror(self) -> ModelParams:
         """Returns the standard error of the parameters that can be used to
         draw confidence intervals.
@@ -506,41 +1872,157 @@ class MultiStateJointModel(HazardMixin):
             flat_se = torch.full_like(params_flat, torch.nan)
 
         # Organize by parameter structure
-        i = 0
+        return self._unflatten_params(flat_se)
 
-        def _next(ref: torch.Tensor) -> torch.Tensor:
-            nonlocal i
-            n = ref.numel()
-            result = flat_se[i : i + n].view(ref.shape)
-            i += n
-            return result
+    def compute_stderror(
+        self,
+        data: ModelData,
+        which: list[str] | None = None,
+        *,
+        n_iter_fim: int = 50,
+        step_size: float = 0.1,
+        adapt_rate: float = 0.1,
+        accept_target: float | None = None,
+        init_warmup: int = 500,
+        cont_warmup: int = 5,
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+        cg_tol: float = 1e-6,
+        cg_max_iter: int | None = None,
+        max_cg_solves: int = 4,
+        penalized: bool = True,
+    ) -> ModelParams:
+        """Computes standard errors from the observed information, matrix free.
+
+        The observed information is given by Louis' identity as Hessian vector
+        products, and every requested variance is the matching entry of a
+        conjugate gradient solve, so that the full matrix is never formed nor
+        inverted. This pays off when few parameters are requested out of many;
+        beyond max_cg_solves entries, the matrix is instead formed from one
+        product per parameter and factorized once.
 
-        gamma = _next(self.params_.gamma)
+        Args:
+            data (ModelData): The dataset to learn from. Should be the same as used in fit.
+            which (list[str] | None, optional): The parameter groups among "gamma", "Q", "R", "alphas" and "betas", None for all of them. Defaults to None.
+            n_iter_fim (int, optional): The number of posterior draws the information is averaged over. Defaults to 50.
+            step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
+            init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
+            cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
+            cg_tol (float, optional): The relative residual tolerance of the conjugate gradient. Defaults to 1e-6.
+            cg_max_iter (int | None, optional): The maximum number of conjugate gradient iterations, None for the number of parameters. Defaults to None.
+            max_cg_solves (int, optional): The number of requested entries up to which conjugate gradient solves are used instead of forming the matrix. Defaults to 4.
+            penalized (bool, optional): Whether to add the Hessian of the penalization, as in compute_fim. Defaults to True.
 
-        Q_flat = _next(self.params_.Q_repr[0])
-        Q_method = self.params_.Q_repr[1]
+        Raises:
+            ValueError: If which contains an unknown group.
+            ValueError: If n_iter_fim is not strictly positive.
 
-        R_flat = _next(self.params_.R_repr[0])
-        R_method = self.params_.R_repr[1]
+        Returns:
+            ModelParams: The standard errors in the same format as the parameters, NaN where not requested or not positive definite.
+        """
 
-        alphas = {key: _next(val) for key, val in self.params_.alphas.items()}
+        groups = ["gamma", "Q", "R", "alphas", "betas"]
+        which = groups if which is None else which
+        for group in which:
+            if group not in groups:
+                raise ValueError(
+                    f"which should only contain gamma, Q, R, alphas or betas, got {group}"
+                )
+        if n_iter_fim <= 0:
+            raise ValueError("n_iter_fim must be strictly positive")
 
-        betas = {key: _next(val) for key, val in self.params_.betas.items()}
+        if not self.fit_:
+            warnings.warn("Model should be fit before computing standard errors")
+
+        # Load and complete data
+        self._prepare_data(data)
 
-        se_params = ModelParams(
-            gamma, (Q_flat, Q_method), (R_flat, R_method), alphas, betas
+        # Group of every tensor, in the order of params_.as_list
+        tensor_groups = (
+            ["gamma", "Q", "R"]
+            + ["alphas"] * len(self.params_.alphas)
+            + ["betas"] * len(self.params_.betas)
+        )
+        self.params_.require_grad(True)
+        sizes = [p.numel() for p in self.params_.as_list]
+        offsets = np.cumsum([0] + sizes)
+        indices = [
+            j
+            for group, start, stop in zip(tensor_groups, offsets[:-1], offsets[1:])
+            if group in which
+            for j in range(start, stop)
+        ]
+
+        # Observed information operator over the posterior draws
+        q = self.params_.Q_dim_
+        draws = self._iter_posterior(
+            data,
+            n_iter_fim,
+            step_size=step_size,
+            adapt_rate=adapt_rate,
+            accept_target=accept_target,
+            init_warmup=init_warmup,
+            cont_warmup=cont_warmup,
+            n_chains=n_chains,
+            rhat_tol=rhat_tol,
+            min_ess=min_ess,
+            desc="Sampling for standard errors",
         )
+        matvec = self._louis_operator(
+            data, torch.cat([b.view(-1, data.size, q) for b in draws]), penalized
+        )
+
+        d = int(offsets[-1])
+        flat_se = torch.full((d,), torch.nan)
+
+        if len(indices) > max_cg_solves:
+            # Form the matrix once rather than solving for every entry
+            info = torch.stack([matvec(e) for e in torch.eye(d)]).detach()
+            chol, status = torch.linalg.cholesky_ex((info + info.T) / 2)
+            if status:
+                warnings.warn("Observed information is not positive definite")
+            else:
+                cols = torch.cholesky_solve(torch.eye(d)[:, indices], chol)
+                flat_se[indices] = cols[indices, range(len(indices))].sqrt()
+
+        else:
+            # One conjugate gradient solve per requested entry
+            for j in indices:
+                e = torch.zeros_like(flat_se)
+                e[j] = 1.0
+                try:
+                    x = conjugate_gradient(matvec, e, tol=cg_tol, max_iter=cg_max_iter)
+                except RuntimeError as err:
+                    warnings.warn(f"Error solving for entry {j}: {err}")
+                    continue
+                flat_se[j] = x[j].sqrt()
+
+        # Summarize numerical issues
+        self._checker.summarize()
 
-        return se_params
+        return self._unflatten_params(flat_se.detach())
 
     def compute_surv_log_probs(
         self, sample_data: SampleData, u: torch.Tensor
     ) -> torch.Tensor:
         """Computes log probabilites of remaining event free up to time u.
 
+        The horizons of every individual split a single grid running from the
+        entry time to the last horizon, whose cells are integrated with a low
+        order rule and accumulated. A whole curve costs n_quad + 2 * eval_points
+        hazard evaluations instead of n_quad * eval_points, with the
+        accuracy of a composite rule rather than that of a Gauss rule per
+        horizon. Closed form transitions are evaluated exactly.
+
         Args:
             sample_data (SampleData): The data on which to compute the probabilities.
-            u (torch.Tensor): The time at which to evaluate the probabilities.
+            u (torch.Tensor): The times at which to evaluate the probabilities, of shape (n, eval_points) in any order.
 
         Raises:
             ValueError: If u is of incorrect shape.
@@ -563,40 +2045,86 @@ class MultiStateJointModel(HazardMixin):
             last_states, torch.full((sample_data.size,), torch.inf)
         )
 
-        nlog_probs = torch.zeros_like(u)
+        return self._surv_log_probs(sample_data.x, sample_data.psi, buckets, u)
 
-        for key, bucket in buckets.items():
-            for k in range(u.shape[1]):
-                alpha, beta = self.params_.alphas[key], self.params_.betas[key]
-                idx, t0, _, _ = bucket
-                t1 = u[:, k]
+    def _surv_log_probs(
+        self,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        buckets: dict[tuple[int, int], tuple[torch.Tensor, ...]],
+        u: torch.Tensor,
+    ) -> torch.Tensor:
+        """Computes survival log probabilities from prebuilt buckets.
 
-                alts_ll = self._cum_hazard(
-                    t0,
-                    t1,
-                    sample_data.x[idx],
-                    sample_data.psi[idx],
+        Args:
+            x (torch.Tensor): The covariates, of shape (n, p).
+            psi (torch.Tensor): The individual parameters, of shape (..., n, d) where leading dimensions are draws.
+            buckets (dict[tuple[int, int], tuple[torch.Tensor, ...]]): The buckets of the last states.
+            u (torch.Tensor): The times at which to evaluate the probabilities, of shape (n, eval_points).
+
+        Returns:
+            torch.Tensor: The survival log probabilities, of shape (..., n, eval_points).
+        """
+
+        # Flatten the draws
+        n, n_points = u.shape
+        lead = psi.shape[:-2]
+        psi = psi.reshape(-1, n, psi.shape[-1])
+        n_draws = psi.shape[0]
+
+        # Sort the horizons so that they split a single grid per row
+        u_sorted, order = u.sort(dim=1)
+        nlog_probs_sorted = torch.zeros(n_draws, n, n_points)
+
+        for key, bucket in buckets.items():
+            alpha, beta = self.params_.alphas[key], self.params_.betas[key]
+            idx, t0, _, _ = bucket
+            closed_form = self.model_design.closed_form(key)
+
+            t1 = u_sorted[idx].expand(n_draws, -1, -1)
+
+            if closed_form is not None:
+                # Every row is repeated once per horizon, then once per draw
+                alts_ll = closed_form.cum_hazard(
+                    t0.flatten().repeat_interleave(n_points).repeat(n_draws),
+                    t1.flatten(),
+                    x[idx].repeat_interleave(n_points, dim=0).repeat(n_draws, 1),
+                    psi[:, idx].repeat_interleave(n_points, dim=1).flatten(0, 1),
                     alpha,
                     beta,
-                    *self.model_design.surv[key],
-                )
+                ).view_as(t1)
+            else:
+                # Integrate all horizons on a single grid per row and draw
+                alts_ll = self._cum_hazards_at(
+                    t0.flatten().repeat(n_draws),
+                    t1.flatten(0, 1),
+                    x[idx].repeat(n_draws, 1),
+                    psi[:, idx].flatten(0, 1),
+                    alpha,
+                    beta,
+                    *self.model_design.surv[key][:2],
+                ).view_as(t1)
 
-                # Check for invalid values
-                if alts_ll.isnan().any() or alts_ll.isinf().any():
-                    warnings.warn(f"Invalid cumulative hazard for bucket {key}")
-                    continue
+            # Check for invalid values
+            if self._checker(alts_ll, f"Invalid cumulative hazard for bucket {key}"):
+                continue
 
-                nlog_probs[:, k].scatter_add_(0, idx, alts_ll)
+            nlog_probs_sorted.index_add_(1, idx, alts_ll)
 
-        log_probs = -nlog_probs
+        # Restore the order of the horizons
+        nlog_probs = torch.empty_like(nlog_probs_sorted).scatter_(
+            2, order.expand(n_draws, -1, -1), nlog_probs_sorted
+        )
 
-        return log_probs
+        return -nlog_probs.view(*lead, n, n_points)
 
     def sample_trajectories(
         self,
         sample_data: SampleData,
         c_max: torch.Tensor,
         max_length: int = 100,
+        *,
+        n_grid: int | None = None,
     ) -> list[Traj]:
         """Sample future trajectories from the fitted joint model.
 
@@ -604,6 +2132,7 @@ class MultiStateJointModel(HazardMixin):
             sample_data (SampleData): Prediction data.
             c_max (torch.Tensor): The maximum trajectory sampling time (censoring time).
             max_length (int, optional): Maximum iterations or sampling (prevents infinite loops). Defaults to 100.
+            n_grid (int | None, optional): The number of cells of the tabulated cumulative hazard used to invert transition times, None to use root finding. Defaults to None.
 
         Raises:
             ValueError: If all the parameters are not set.
@@ -654,7 +2183,7 @@ class MultiStateJointModel(HazardMixin):
                         idx, t0, t1, _ = bucket_info
 
                         # Sample transition times
-                        t_sample = self._sample_trajectory_step(
+                        step_args = (
                             t0,
                             torch.nextafter(
                                 t1, torch.tensor(torch.inf, dtype=torch.float32)
@@ -663,15 +2192,32 @@ class MultiStateJointModel(HazardMixin):
                             sample_data.psi[idx],
                             alpha,
                             beta,
-                            *self.model_design.surv[transition_key],
-                            c=(
-                                sample_data.c[idx]
-                                if not iteration and sample_data.c is not None
-                                else None
-                            ),
-                            n_bissect=self.n_bissect,
+                            *self.model_design.surv[transition_key][:2],
+                        )
+                        closed_form = self.model_design.closed_form(transition_key)
+                        c = (
+                            sample_data.c[idx]
+                            if not iteration and sample_data.c is not None
+                            else None
                         )
 
+                        if n_grid is not None:
+                            t_sample = self._sample_trajectory_step_tab(
+                                *step_args,
+                                c=c,
+                                n_grid=n_grid,
+                                closed_form=closed_form,
+                            )
+                        else:
+                            t_sample = self._sample_trajectory_step(
+                                *step_args,
+                                c=c,
+                                n_bissect=self.n_bissect,
+                                atol=self.root_atol,
+                                rtol=self.root_rtol,
+                                closed_form=closed_form,
+                            )
+
                         # Store candidate times
                         t_candidates[idx, j] = t_sample
 
@@ -724,29 +2270,41 @@ class MultiStateJointModel(HazardMixin):
         n_iter_b: int,
         step_size: float = 0.1,
         adapt_rate: float = 0.1,
-        accept_target: float = 0.234,
+        accept_target: float | None = None,
         init_warmup: int = 500,
         cont_warmup: int = 5,
-    ) -> list[torch.Tensor]:
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+        chunk_size: int | None = 32,
+    ) -> torch.Tensor:
         """Predicts the survival (event free) probabilities for new individuals.
 
+        The random effects draws are collected first, then the buckets are
+        built once and the probabilities of all draws are evaluated in
+        broadcasted passes over chunks of draws.
+
         Args:
             pred_data (ModelData): Prediction data.
             u (torch.Tensor): The evaluation times of the probabilities.
             n_iter_b (int): Number of iterations for random effects sampling.
             step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
             adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
-            accept_target (float, optional): Mean acceptation target. Defaults to 0.234.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
             init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
             cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
-            max_length (int, optional): Maximum iterations or sampling (prevents infinite loops). Defaults to 100.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
+            chunk_size (int | None, optional): The number of draws evaluated per pass, None for all of them at once. Defaults to 32.
 
         Raises:
             ValueError: If u is of incorrect shape.
+            ValueError: If chunk_size is not None and not strictly positive.
             RuntimeError: If the computation fails.
 
         Returns:
-            list[torch.Tensor]: A list for each b of survival probabilities.
+            torch.Tensor: The survival log probabilities, of shape (n_iter_b, n, eval_points).
         """
 
         try:
@@ -756,44 +2314,153 @@ class MultiStateJointModel(HazardMixin):
                 raise ValueError(
                     "u has incorrect shape, got {u.shape}, expected {(sample_data.size, eval_points)}"
                 )
+            if chunk_size is not None and chunk_size <= 0:
+                raise ValueError("chunk_size must be None or strictly positive")
 
             # Load and complete prediction data
             self._prepare_data(pred_data)
 
-            # Set up MCMC for prediction
-            sampler = self._setup_mcmc(pred_data, step_size, adapt_rate, accept_target)
+            # Collect the draws, taking from the chains in turn
+            q = self.params_.Q_dim_
+            draws = self._iter_posterior(
+                pred_data,
+                -(-n_iter_b // n_chains),
+                step_size=step_size,
+                adapt_rate=adapt_rate,
+                accept_target=accept_target,
+                init_warmup=init_warmup,
+                cont_warmup=cont_warmup,
+                n_chains=n_chains,
+                rhat_tol=rhat_tol,
+                min_ess=min_ess,
+                desc="Predicting survival probabilities",
+            )
+            all_b = torch.cat([b.view(-1, pred_data.size, q) for b in draws])
+            all_b = all_b[:n_iter_b]
 
-            # Warmup MCMC
-            sampler.warmup(init_warmup)
+            # Build the buckets of the last states once
+            last_states = [trajectory[-1:] for trajectory in pred_data.trajectories]
+            buckets = self._build_vec_rep(
+                last_states, torch.full((pred_data.size,), torch.inf)
+            )
 
-            # Generate predicted probabilites
-            predicted_log_probs: list[torch.Tensor] = []
+            # Conditioning time and horizons in a single pass
+            cu = torch.cat([pred_data.c.view(-1, 1), u], dim=1)
+            chunk_size = n_iter_b if chunk_size is None else chunk_size
+
+            with torch.no_grad():
+                psi = self._psi(all_b)
+                log_probs = torch.cat(
+                    [
+                        self._surv_log_probs(pred_data.x, chunk, buckets, cu)
+                        for chunk in psi.split(chunk_size)
+                    ]
+                )
 
-            for _ in tqdm(range(n_iter_b), desc="Predicting survival probabilities"):
-                # Sample random effects
-                sampler.warmup(cont_warmup)
+            # Summarize numerical issues
+            self._checker.summarize()
 
-                current_b, _ = sampler.step()
+            return torch.clamp(log_probs[..., 1:] - log_probs[..., :1], max=0.0)
+
+        except Exception as e:
+            raise RuntimeError(f"Error in survival prediction: {e}") from e
+
+    def iter_surv_log_probs(
+        self,
+        pred_data: ModelData,
+        u: torch.Tensor,
+        *,
+        n_iter_b: int,
+        step_size: float = 0.1,
+        adapt_rate: float = 0.1,
+        accept_target: float | None = None,
+        init_warmup: int = 500,
+        cont_warmup: int = 5,
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+    ) -> Iterator[torch.Tensor]:
+        """Yields the survival (event free) log probabilities draw by draw.
+
+        Only the draws of the current sampler step are held in memory, so that
+        they can be fed to the streaming reducers of jmstate.summaries.
+
+        Args:
+            pred_data (ModelData): Prediction data.
+            u (torch.Tensor): The evaluation times of the probabilities.
+            n_iter_b (int): Number of iterations for random effects sampling.
+            step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
+            init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
+            cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
 
-                # Transform to individual-specific parameters
-                psi = self.model_design.f(self.params_.gamma, current_b)
+        Raises:
+            ValueError: If u is of incorrect shape.
+            RuntimeError: If the computation fails.
 
-                sample_data = SampleData(pred_data.x, pred_data.trajectories, psi)
+        Yields:
+            torch.Tensor: The survival log probabilities of a draw, of shape (n, eval_points).
+        """
 
-                c_log_probs = self.compute_surv_log_probs(
-                    sample_data, pred_data.c.view(-1, 1)
+        try:
+            # Convert and check if c_max matches the right shape
+            u = torch.as_tensor(u, dtype=torch.float32)
+            if u.ndim != 2 or u.shape[0] != pred_data.size:
+                raise ValueError(
+                    "u has incorrect shape, got {u.shape}, expected {(sample_data.size, eval_points)}"
                 )
-                u_log_probs = self.compute_surv_log_probs(sample_data, u)
-                current_log_probs = torch.clamp(u_log_probs - c_log_probs, max=0.0)
 
-                predicted_log_probs.append(current_log_probs)
+            # Load and complete prediction data
+            self._prepare_data(pred_data)
+
+            # Build the buckets of the last states once
+            last_states = [trajectory[-1:] for trajectory in pred_data.trajectories]
+            buckets = self._build_vec_rep(
+                last_states, torch.full((pred_data.size,), torch.inf)
+            )
+
+            # Conditioning time and horizons in a single pass
+            cu = torch.cat([pred_data.c.view(-1, 1), u], dim=1)
+            q = self.params_.Q_dim_
+            n_yielded = 0
+
+            try:
+                for chains_b in self._iter_posterior(
+                    pred_data,
+                    -(-n_iter_b // n_chains),
+                    step_size=step_size,
+                    adapt_rate=adapt_rate,
+                    accept_target=accept_target,
+                    init_warmup=init_warmup,
+                    cont_warmup=cont_warmup,
+                    n_chains=n_chains,
+                    rhat_tol=rhat_tol,
+                    min_ess=min_ess,
+                    desc="Predicting survival probabilities",
+                ):
+                    with torch.no_grad():
+                        psi = self._psi(chains_b.view(-1, pred_data.size, q))
+                        log_probs = self._surv_log_probs(pred_data.x, psi, buckets, cu)
+                        log_probs = torch.clamp(
+                            log_probs[..., 1:] - log_probs[..., :1], max=0.0
+                        )
 
-            return predicted_log_probs
+                    # Draw from the chains in turn
+                    for current_log_probs in log_probs[: n_iter_b - n_yielded]:
+                        yield current_log_probs
+                        n_yielded += 1
+            finally:
+                # Summarize numerical issues, even if the iterator is closed early
+                self._checker.summarize()
 
         except Exception as e:
             raise RuntimeError(f"Error in survival prediction: {e}") from e
 
-    def predict_trajectories(
+    def iter_trajectories(
         self,
         pred_data: ModelData,
         c_max: torch.Tensor,
@@ -802,12 +2469,19 @@ class MultiStateJointModel(HazardMixin):
         n_iter_T: int,
         step_size: float = 0.1,
         adapt_rate: float = 0.1,
-        accept_target: float = 0.234,
+        accept_target: float | None = None,
         init_warmup: int = 500,
         cont_warmup: int = 5,
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
         max_length: int = 100,
-    ) -> list[list[list[Traj]]]:
-        """Predict survival trajectories for new individuals.
+        n_grid: int | None = None,
+    ) -> Iterator[list[Traj]]:
+        """Yields predicted trajectories of new individuals replicate by replicate.
+
+        Cohorts are yielded ordered by random effects draw, then by replicate,
+        so that they can be fed to the streaming reducers of jmstate.summaries.
 
         Args:
             pred_data (ModelData): Prediction data.
@@ -816,16 +2490,20 @@ class MultiStateJointModel(HazardMixin):
             n_iter_T (int): Number of trajectory samples per random effects sample.
             step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
             adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
-            accept_target (float, optional): Mean acceptation target. Defaults to 0.234.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
             init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
             cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
             max_length (int, optional): Maximum iterations or sampling (prevents infinite loops). Defaults to 100.
+            n_grid (int | None, optional): The number of cells of the tabulated cumulative hazard, shared by the n_iter_T replicates of a draw. None to use root finding. Defaults to None.
 
         Raises:
             RuntimeError: If the prediction fails.
 
-        Returns:
-            list[list[list[Traj]]]: A list of lists of trajectories. First list is for a b sample, then multiples iid drawings of the trajectories.
+        Yields:
+            list[Traj]: The trajectories of every individual for a replicate.
         """
 
         try:
@@ -839,49 +2517,205 @@ class MultiStateJointModel(HazardMixin):
             # Load and complete prediction data
             self._prepare_data(pred_data)
 
-            # Set up MCMC for prediction
-            sampler = self._setup_mcmc(pred_data, step_size, adapt_rate, accept_target)
-
-            # Warmup MCMC
-            sampler.warmup(init_warmup)
-
             # Prepare replicate data for trajectory sampling
             x_rep = pred_data.x.repeat(n_iter_T, 1)
             trajectories_rep = pred_data.trajectories * n_iter_T
             c_rep = pred_data.c.repeat(n_iter_T)
             c_max_rep = c_max.repeat(n_iter_T)
+            q = self.params_.Q_dim_
+            n_yielded = 0
+
+            try:
+                for chains_b in self._iter_posterior(
+                    pred_data,
+                    -(-n_iter_b // n_chains),
+                    step_size=step_size,
+                    adapt_rate=adapt_rate,
+                    accept_target=accept_target,
+                    init_warmup=init_warmup,
+                    cont_warmup=cont_warmup,
+                    n_chains=n_chains,
+                    rhat_tol=rhat_tol,
+                    min_ess=min_ess,
+                    desc="Predicting trajectories",
+                ):
+                    # Draw from the chains in turn
+                    for current_b in chains_b.view(-1, pred_data.size, q):
+                        if n_yielded == n_iter_b:
+                            break
 
-            # Generate predictions
-            predicted_trajectories: list[list[list[Traj]]] = []
+                        # Transform to individual-specific parameters
+                        psi = self.model_design.f(self.params_.gamma, current_b)
 
-            for _ in tqdm(range(n_iter_b), desc="Predicting trajectories"):
-                # Sample random effects
-                sampler.warmup(cont_warmup)
+                        # Replicate for multiple trajectory samples
+                        psi_rep = psi.detach().repeat(n_iter_T, 1)
 
-                current_b, _ = sampler.step()
+                        sample_data = SampleData(
+                            x_rep, trajectories_rep, psi_rep, c_rep
+                        )
 
-                # Transform to individual-specific parameters
-                psi = self.model_design.f(self.params_.gamma, current_b)
+                        # Sample trajectories
+                        current_trajectories = self.sample_trajectories(
+                            sample_data, c_max_rep, max_length, n_grid=n_grid
+                        )
 
-                # Replicate for multiple trajectory samples
-                psi_rep = psi.repeat(n_iter_T, 1)
+                        # Yield by trajectory iteration
+                        for i in range(n_iter_T):
+                            yield current_trajectories[
+                                i * pred_data.size : (i + 1) * pred_data.size
+                            ]
 
-                sample_data = SampleData(x_rep, trajectories_rep, psi_rep, c_rep)
+                        n_yielded += 1
+            finally:
+                # Summarize numerical issues, even if the iterator is closed early
+                self._checker.summarize()
 
-                # Sample trajectories
-                current_trajectories = self.sample_trajectories(
-                    sample_data, c_max_rep, max_length
-                )
+        except Exception as e:
+            raise RuntimeError(f"Error in survival prediction: {e}") from e
 
-                # Organize by trajectory iteration
-                trajectory_chunks = [
-                    current_trajectories[i * pred_data.size : (i + 1) * pred_data.size]
-                    for i in range(n_iter_T)
-                ]
+    def predict_trajectories(
+        self,
+        pred_data: ModelData,
+        c_max: torch.Tensor,
+        *,
+        n_iter_b: int,
+        n_iter_T: int,
+        step_size: float = 0.1,
+        adapt_rate: float = 0.1,
+        accept_target: float | None = None,
+        init_warmup: int = 500,
+        cont_warmup: int = 5,
+        n_chains: int = 1,
+        rhat_tol: float | None = None,
+        min_ess: float = 0.0,
+        max_length: int = 100,
+        n_grid: int | None = None,
+    ) -> list[list[list[Traj]]]:
+        """Predict survival trajectories for new individuals.
+
+        Args:
+            pred_data (ModelData): Prediction data.
+            c_max (torch.Tensor): Maximum prediction times.
+            n_iter_b (int): Number of iterations for random effects sampling.
+            n_iter_T (int): Number of trajectory samples per random effects sample.
+            step_size (float, optional): Kernel standard error in Metropolis Hastings. Defaults to 0.1.
+            adapt_rate (float, optional): Adaptation rate for the step_size. Defaults to 0.1.
+            accept_target (float | None, optional): Mean acceptation target, None for the kernel default, 0.234 for random walks, 0.574 for MALA and 0.65 for HMC. Defaults to None.
+            init_warmup (int, optional): The number of iteration steps used in the warmup. Defaults to 500.
+            cont_warmup (int, optional): The warmup step in-between each parameter changes. Defaults to 5.
+            n_chains (int, optional): The number of MCMC chains per individual, run as an extra tensor dimension. Defaults to 1.
+            rhat_tol (float | None, optional): The split R-hat tolerance under which the initial warmup stops early, None to always run init_warmup steps. Defaults to None.
+            min_ess (float, optional): The minimum effective sample size under which the initial warmup does not stop early. Defaults to 0.0.
+            max_length (int, optional): Maximum iterations or sampling (prevents infinite loops). Defaults to 100.
+            n_grid (int | None, optional): The number of cells of the tabulated cumulative hazard, shared by the n_iter_T replicates of a draw. None to use root finding. Defaults to None.
 
-                predicted_trajectories.append(trajectory_chunks)
+        Raises:
+            RuntimeError: If the prediction fails.
 
-            return predicted_trajectories
+        Returns:
+            list[list[list[Traj]]]: A list of lists of trajectories. First list is for a b sample, then multiples iid drawings of the trajectories.
+        """
 
-        except Exception as e:
-            raise RuntimeError(f"Error in survival prediction: {e}") from e
+        cohorts = list(
+            self.iter_trajectories(
+                pred_data,
+                c_max,
+                n_iter_b=n_iter_b,
+                n_iter_T=n_iter_T,
+                step_size=step_size,
+                adapt_rate=adapt_rate,
+                accept_target=accept_target,
+                init_warmup=init_warmup,
+                cont_warmup=cont_warmup,
+                n_chains=n_chains,
+                rhat_tol=rhat_tol,
+                min_ess=min_ess,
+                max_length=max_length,
+                n_grid=n_grid,
+            )
+        )
+
+        # Organize by random effects draw
+        return [cohorts[i : i + n_iter_T] for i in range(0, len(cohorts), n_iter_T)]
+
+
+def _fit_worker(
+    model: MultiStateJointModel,
+    rank: int,
+    world_size: int,
+    shard: ModelData,
+    master_port: int,
+    seed: int,
+    n_threads: int,
+    fit_kwargs: dict[str, Any],
+    queue: Any,
+) -> None:
+    """Fits a copy of the model on a shard as part of a process group.
+
+    On failure, the error is reported and the process group torn down, so that
+    the other workers do not wait for this one.
+
+    Args:
+        model (MultiStateJointModel): The copied model.
+        rank (int): The rank of the worker.
+        world_size (int): The number of workers.
+        shard (ModelData): The individuals of the worker.
+        master_port (int): The local port of the process group rendezvous.
+        seed (int): The seed of the worker.
+        n_threads (int): The number of intra-op threads of the worker.
+        fit_kwargs (dict[str, Any]): The keyword arguments passed to fit.
+        queue (Any): The queue receiving the parameters of the first worker, or the error of any worker.
+    """
+
+    import torch.distributed as dist
+
+    torch.manual_seed(seed)
+    torch.set_num_threads(n_threads)
+
+    try:
+        dist.init_process_group(
+            "gloo",
+            init_method=f"tcp://127.0.0.1:{master_port}",
+            rank=rank,
+            world_size=world_size,
+        )
+
+        # Sum the shard objectives, the penalization being split
+        model._n_workers = world_size
+
+        def sync_grads(
+            params_list: list[torch.Tensor], loss: torch.Tensor
+        ) -> torch.Tensor:
+            grads = [
+                torch.zeros_like(p) if p.grad is None else p.grad for p in params_list
+            ]
+            flat = torch.cat([g.flatten() for g in grads] + [loss.detach().view(1)])
+            dist.all_reduce(flat)
+
+            i = 0
+            for p, g in zip(params_list, grads):
+                p.grad = flat[i : i + g.numel()].view_as(g).clone()
+                i += g.numel()
+
+            return flat[-1]
+
+        model._sync_grads = sync_grads
+        model._progress = rank == 0
+
+        model.fit(shard, **fit_kwargs)
+
+        if rank == 0:
+            queue.put(
+                (
+                    [p.detach().numpy() for p in model.params_.as_list],
+                    model.n_iter_fit_,
+                )
+            )
+
+        dist.destroy_process_group()
+
+    except Exception as e:
+        queue.put(RuntimeError(f"Worker {rank} failed: {e}"))
+        if dist.is_initialized():
+            dist.destroy_process_group()
+        raise
@@ -0,0 +1,234 @@
+from typing import Any
+
+import torch
+
+from .utils import Traj
+
+
+class RunningMoments:
+    """Online mean and variance of a stream of draws.
+
+    Uses Welford's updates, so that only the running mean and sum of squared
+    deviations are kept whatever the number of draws.
+    """
+
+    def __init__(self):
+        """Initialize the running moments."""
+
+        self.n_ = 0
+        self.mean_: torch.Tensor | None = None
+        self.m2_: torch.Tensor | None = None
+
+    def update(self, x: torch.Tensor) -> None:
+        """Records a draw.
+
+        Args:
+            x (torch.Tensor): The draw, of the same shape at every call.
+        """
+
+        x = x.detach()
+        self.n_ += 1
+
+        if self.mean_ is None or self.m2_ is None:
+            self.mean_ = x.clone()
+            self.m2_ = torch.zeros_like(x)
+            return
+
+        delta = x - self.mean_
+        self.mean_ += delta / self.n_
+        self.m2_ += delta * (x - self.mean_)
+
+    @property
+    def mean(self) -> torch.Tensor:
+        """Gets the mean of the draws.
+
+        Raises:
+            ValueError: If no draw was recorded.
+
+        Returns:
+            torch.Tensor: The elementwise mean.
+        """
+
+        if self.mean_ is None:
+            raise ValueError("No draw was recorded")
+
+        return self.mean_
+
+    @property
+    def variance(self) -> torch.Tensor:
+        """Gets the unbiased variance of the draws.
+
+        Raises:
+            ValueError: If less than two draws were recorded.
+
+        Returns:
+            torch.Tensor: The elementwise variance.
+        """
+
+        if self.m2_ is None or self.n_ < 2:
+            raise ValueError("At least two draws must be recorded")
+
+        return self.m2_ / (self.n_ - 1)
+
+
+class GridQuantiles:
+    """Online quantiles of a stream of draws on a fixed grid.
+
+    Every draw is binned on the grid, so that memory only depends on the grid
+    size. Quantiles are linearly interpolated within a cell, and values out of
+    the grid range are clamped to its ends.
+    """
+
+    def __init__(self, grid: torch.Tensor):
+        """Initialize the quantile sketch.
+
+        Args:
+            grid (torch.Tensor): The increasing grid of values.
+
+        Raises:
+            ValueError: If grid is not 1D with at least two points.
+            ValueError: If grid is not strictly increasing.
+        """
+
+        grid = torch.as_tensor(grid, dtype=torch.float32)
+        if grid.ndim != 1 or grid.numel() < 2:
+            raise ValueError(
+                f"grid must be 1D with at least two points, got shape {grid.shape}"
+            )
+        if (grid.diff() <= 0).any():
+            raise ValueError("grid must be strictly increasing")
+
+        self.grid = grid
+
+        self.n_ = 0
+        self.counts_: torch.Tensor | None = None
+
+    def update(self, x: torch.Tensor) -> None:
+        """Records a draw.
+
+        Args:
+            x (torch.Tensor): The draw, of the same shape at every call.
+        """
+
+        x = x.detach().clamp(self.grid[0], self.grid[-1])
+        if self.counts_ is None:
+            self.counts_ = torch.zeros(*x.shape, self.grid.numel())
+
+        # Cell j holds the values in (grid[j - 1], grid[j]]
+        cells = torch.searchsorted(self.grid, x.contiguous()).unsqueeze(-1)
+        self.counts_.scatter_add_(-1, cells, torch.ones_like(x).unsqueeze(-1))
+        self.n_ += 1
+
+    def quantile(self, levels: torch.Tensor | float) -> torch.Tensor:
+        """Gets quantiles of the draws.
+
+        Args:
+            levels (torch.Tensor | float): The quantile levels in [0, 1].
+
+        Raises:
+            ValueError: If no draw was recorded.
+
+        Returns:
+            torch.Tensor: The quantiles, with the shape of the draws followed by that of levels.
+        """
+
+        if self.counts_ is None:
+            raise ValueError("No draw was recorded")
+
+        levels = torch.as_tensor(levels, dtype=torch.float32)
+        lead = self.counts_.shape[:-1]
+
+        # Empirical distribution function on the grid
+        cdf = self.counts_.cumsum(dim=-1) / self.n_
+        p = levels.flatten().expand(*lead, -1).contiguous()
+
+        # Interpolate within the first cell reaching the level
+        hi = torch.searchsorted(cdf, p).clamp(1, self.grid.numel() - 1)
+        cdf_lo, cdf_hi = cdf.gather(-1, hi - 1), cdf.gather(-1, hi)
+        frac = ((p - cdf_lo) / (cdf_hi - cdf_lo).clamp(min=1e-12)).clamp(0.0, 1.0)
+        values = self.grid[hi - 1] + frac * (self.grid[hi] - self.grid[hi - 1])
+
+        return values.view(*lead, *levels.shape)
+
+
+class StateOccupation:
+    """Online state occupation probabilities of a stream of trajectories.
+
+    Counts, for every individual and evaluation time, how many trajectories
+    are in each state. Trajectories are only known up to their censoring
+    time, so the evaluation times should not exceed it.
+    """
+
+    def __init__(self, times: torch.Tensor, states: list[Any]):
+        """Initialize the occupation counts.
+
+        Args:
+            times (torch.Tensor): The evaluation times, of shape (T,) or (n, T) for individual times.
+            states (list[Any]): The states to count.
+
+        Raises:
+            ValueError: If times is not 1D nor 2D.
+        """
+
+        times = torch.as_tensor(times, dtype=torch.float32)
+        if times.ndim not in (1, 2):
+            raise ValueError(f"times must be 1D or 2D, got {times.ndim}D")
+
+        self.times = times
+        self.states = states
+        self._state_idx = {state: j for j, state in enumerate(states)}
+
+        self.n_ = 0
+        self.counts_: torch.Tensor | None = None
+
+    def update(self, trajectories: list[Traj]) -> None:
+        """Records a sampled trajectory for every individual.
+
+        Args:
+            trajectories (list[Traj]): The trajectories of the individuals.
+
+        Raises:
+            ValueError: If the number of trajectories is inconsistent with times.
+        """
+
+        n = len(trajectories)
+        times = self.times.expand(n, -1) if self.times.ndim == 1 else self.times
+        if times.shape[0] != n:
+            raise ValueError(
+                f"Expected {times.shape[0]} trajectories, got {n} trajectories"
+            )
+
+        if self.counts_ is None:
+            self.counts_ = torch.zeros(n, times.shape[1], len(self.states))
+
+        for i, trajectory in enumerate(trajectories):
+            jump_times = torch.tensor([t for t, _ in trajectory], dtype=torch.float32)
+            state_idx = torch.tensor(
+                [self._state_idx.get(s, -1) for _, s in trajectory], dtype=torch.int64
+            )
+
+            # State at every time is the last one entered before it
+            pos = torch.searchsorted(jump_times, times[i], right=True) - 1
+            known = pos >= 0
+            current = state_idx[pos.clamp(min=0)]
+            keep = known & (current >= 0)
+
+            self.counts_[i, keep, current[keep]] += 1.0
+
+        self.n_ += 1
+
+    @property
+    def probabilities(self) -> torch.Tensor:
+        """Gets the state occupation probabilities.
+
+        Raises:
+            ValueError: If no trajectory was recorded.
+
+        Returns:
+            torch.Tensor: The probabilities, of shape (n, T, n_states).
+        """
+
+        if self.counts_ is None:
+            raise ValueError("No trajectory was recorded")
+
+        return self.counts_ / self.n_
@@ -1,7 +1,15 @@
 from math import isqrt
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Callable, DefaultDict, TypeAlias, cast
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Protocol,
+    TypeAlias,
+    cast,
+    runtime_checkable,
+)
 
 import torch
 
@@ -14,6 +22,43 @@ BaseFun: TypeAlias = Callable[[torch.Tensor, torch.Tensor], torch.Tensor]
 Traj: TypeAlias = list[tuple[float, Any]]
 
 
+@runtime_checkable
+class ClosedFormHazard(Protocol):
+    """Protocol for transitions with an exact cumulative hazard.
+
+    It may be given as third element of a ModelDesign.surv entry, in which case
+    quadrature is skipped for this transition. An exact inverse may also be
+    provided through an inv_cum_hazard(t0, target, x, psi, alpha, beta) method
+    returning the times at which the cumulative hazard reaches target, in which
+    case transition sampling skips root finding as well. All time arguments are
+    1D tensors.
+    """
+
+    def cum_hazard(
+        self,
+        t0: torch.Tensor,
+        t1: torch.Tensor,
+        x: torch.Tensor,
+        psi: torch.Tensor,
+        alpha: torch.Tensor,
+        beta: torch.Tensor,
+    ) -> torch.Tensor:
+        """Computes the cumulative hazard of a sojourn started at t0 up to t1.
+
+        Args:
+            t0 (torch.Tensor): Start time.
+            t1 (torch.Tensor): End time.
+            x (torch.Tensor): Covariates.
+            psi (torch.Tensor): Inidivual parameters.
+            alpha (torch.Tensor): Link linear parameters.
+            beta (torch.Tensor): Covariate linear parameters.
+
+        Returns:
+            torch.Tensor: The computed cumulative hazard.
+        """
+        ...
+
+
 @dataclass
 class ModelDesign:
     """Class containing all multistate joint model design.
@@ -23,6 +68,8 @@ class ModelDesign:
         TypeError: If h is not callable.
         TypeError: If any of the base hazard functions is not callable.
         TypeError: If any of the link functions is not callable.
+        TypeError: If any of the closed forms does not follow ClosedFormHazard.
+        ValueError: If any of the surv entries is not of length 2 or 3.
         ValueError: If the keys of alpha_dims and surv do not match.
     """
 
@@ -30,10 +77,7 @@ class ModelDesign:
     h: RegFun
     surv: dict[
         tuple[int, int],
-        tuple[
-            BaseFun,
-            LinkFun,
-        ],
+        tuple[BaseFun, LinkFun] | tuple[BaseFun, LinkFun, ClosedFormHazard],
     ]
 
     def __post_init__(self):
@@ -48,6 +92,8 @@ class ModelDesign:
             TypeError: If h is not callable.
             TypeError: If any of the base hazard functions is not callable.
             TypeError: If any of the link functions is not callable.
+            TypeError: If any of the closed forms does not follow ClosedFormHazard.
+            ValueError: If any of the surv entries is not of length 2 or 3.
             ValueError: If the keys of alpha_dims and surv do not match.
         """
         if not callable(self.f):
@@ -55,11 +101,59 @@ class ModelDesign:
         if not callable(self.h):
             raise TypeError("h must be callable")
 
-        for key, (base_fn, link_fn) in self.surv.items():
+        for key, entry in self.surv.items():
+            if len(entry) not in (2, 3):
+                raise ValueError(f"Surv entry for key {key} must be of length 2 or 3")
+
+            base_fn, link_fn = entry[:2]
             if not callable(base_fn):
                 raise TypeError(f"Base hazard function for key {key} must be callable")
             if not callable(link_fn):
                 raise TypeError(f"Link function for key {key} must be callable")
+            if len(entry) == 3 and not isinstance(entry[2], ClosedFormHazard):
+                raise TypeError(
+                    f"Closed form for key {key} must implement ClosedFormHazard"
+                )
+
+    def closed_form(self, key: tuple[int, int]) -> ClosedFormHazard | None:
+        """Gets the closed form cumulative hazard of a transition if any.
+
+        Args:
+            key (tuple[int, int]): The transition key.
+
+        Returns:
+            ClosedFormHazard | None: The closed form, None if it should be integrated numerically.
+        """
+        entry = self.surv[key]
+        return entry[2] if len(entry) == 3 else None
+
+
+@dataclass
+class HazardGroup:
+    """Dataclass containing a precompiled group of transitions sharing the same
+    origin state, sojourns and link function.
+
+    Attributes:
+        keys (list[tuple[int, int]]): The transition keys.
+        g (LinkFun): The shared link function.
+        idx (torch.Tensor): The individual index of each sojourn.
+        t0 (torch.Tensor): The sojourn start times, of shape (m, 1).
+        t1 (torch.Tensor): The sojourn end times, of shape (m, 1).
+        ts (torch.Tensor): The endpoint followed by the quadrature points.
+        hw (torch.Tensor): The quadrature weights scaled by the half widths.
+        x (torch.Tensor): The gathered covariates x[idx].
+        obs (list[torch.Tensor]): The observed transition mask of each key.
+    """
+
+    keys: list[tuple[int, int]]
+    g: LinkFun
+    idx: torch.Tensor
+    t0: torch.Tensor
+    t1: torch.Tensor
+    ts: torch.Tensor
+    hw: torch.Tensor
+    x: torch.Tensor
+    obs: list[torch.Tensor]
 
 
 @dataclass
@@ -92,6 +186,9 @@ class ModelData:
     buckets_: dict[tuple[int, int], tuple[torch.Tensor, ...]] = field(
         init=False, repr=False
     )
+    groups_: list[HazardGroup] = field(init=False, repr=False)
+    hazard_cache_: dict[Any, Any] = field(init=False, repr=False, default_factory=dict)
+    prepared_key_: Any = field(init=False, repr=False, default=None)
 
     def __post_init__(self):
         """Runs the post init conversions and checks."""
@@ -663,3 +760,56 @@ def build_buckets(
 
     except Exception as e:
         raise RuntimeError(f"Failed to construct buckets: {e}") from e
+
+
+def conjugate_gradient(
+    matvec: Callable[[torch.Tensor], torch.Tensor],
+    rhs: torch.Tensor,
+    *,
+    tol: float = 1e-6,
+    max_iter: int | None = None,
+) -> torch.Tensor:
+    """Solves a symmetric positive definite system given only its products.
+
+    Args:
+        matvec (Callable[[torch.Tensor], torch.Tensor]): The matrix vector product.
+        rhs (torch.Tensor): The right hand side vector.
+        tol (float, optional): The relative residual tolerance. Defaults to 1e-6.
+        max_iter (int | None, optional): The maximum number of iterations, None for the dimension. Defaults to None.
+
+    Raises:
+        RuntimeError: If a search direction has a non positive curvature.
+
+    Returns:
+        torch.Tensor: The approximate solution.
+    """
+
+    max_iter = rhs.numel() if max_iter is None else max_iter
+
+    x = torch.zeros_like(rhs)
+    r = rhs.clone()
+    p = r.clone()
+    rs = r @ r
+    rhs_norm = rhs.norm()
+
+    for _ in range(max_iter):
+        if rs.sqrt() <= tol * rhs_norm:
+            break
+
+        Ap = matvec(p)
+        pAp = p @ Ap
+        if pAp <= 0:
+            raise RuntimeError(
+                f"Matrix is not positive definite, got curvature {pAp.item()}"
+            )
+
+        # Step along the conjugate direction
+        alpha = rs / pAp
+        x += alpha * p
+        r -= alpha * Ap
+
+        rs_new = r @ r
+        p = r + (rs_new / rs) * p
+        rs = rs_new
+
+    return x
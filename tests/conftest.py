@@ -0,0 +1,62 @@
+import pytest
+import torch
+
+from jmstate import MultiStateJointModel
+from jmstate.utils import ModelData, ModelDesign, ModelParams, SampleData
+
+
+def log_gompertz(t1: torch.Tensor, t0: torch.Tensor) -> torch.Tensor:
+    return -2.0 + 0.05 * (t1 - t0) + 0.01 * t0
+
+
+def linear(t: torch.Tensor, x: torch.Tensor, psi: torch.Tensor) -> torch.Tensor:
+    return (psi[:, [0]] + psi[:, [1]] * t).unsqueeze(-1)
+
+
+def identity(gamma: torch.Tensor, b: torch.Tensor) -> torch.Tensor:
+    return gamma + b
+
+
+def zero_pen(params: ModelParams) -> torch.Tensor:
+    return 0.0 * params.gamma.sum()
+
+
+KEYS = [(0, 1), (0, 2), (1, 2)]
+
+
+@pytest.fixture
+def design() -> ModelDesign:
+    """An illness-death design with Gompertz baselines and a linear marker."""
+
+    return ModelDesign(identity, linear, {key: (log_gompertz, linear) for key in KEYS})
+
+
+@pytest.fixture
+def params() -> ModelParams:
+    """The parameters the data is simulated from."""
+
+    return ModelParams(
+        torch.tensor([0.5, 0.1]),
+        (torch.zeros(2), "diag"),
+        (torch.zeros(1), "ball"),
+        {key: torch.tensor([0.3]) for key in KEYS},
+        {key: torch.tensor([0.2]) for key in KEYS},
+    )
+
+
+def simulate(model: MultiStateJointModel, n: int = 50, seed: int = 0) -> ModelData:
+    """Simulates trajectories and longitudinal values from a model."""
+
+    torch.manual_seed(seed)
+    x = torch.randn(n, 1)
+    c = torch.rand(n) * 5 + 10
+    psi = model.model_design.f(model.params_.gamma, 0.1 * torch.randn(n, 2))
+
+    sample_data = SampleData(x, [[(0.0, 0)] for _ in range(n)], psi)
+    trajectories = model.sample_trajectories(sample_data, c)
+
+    t = torch.linspace(0, 15, 16)
+    y = linear(t, x, psi) + 0.1 * torch.randn(n, t.numel(), 1)
+    y[t.repeat(n, 1) > c.view(-1, 1)] = torch.nan
+
+    return ModelData(x, t, y, trajectories, c)
@@ -0,0 +1,30 @@
+import pickle
+
+from jmstate import MultiStateJointModel
+
+from .conftest import simulate, zero_pen
+
+
+def test_model_with_penalization_is_picklable(design, params):
+    model = MultiStateJointModel(design, params, pen=zero_pen)
+
+    restored = pickle.loads(pickle.dumps(model))
+
+    assert restored.pen(restored.params_).item() == 0.0
+
+
+def test_fit_distributed_spawn(design, params):
+    model = MultiStateJointModel(design, params, pen=zero_pen)
+    data = simulate(model, n=20)
+
+    model.fit_distributed(
+        data,
+        n_workers=2,
+        master_port=29517,
+        start_method="spawn",
+        n_iter=3,
+        init_warmup=10,
+    )
+
+    assert model.fit_
+    assert model.n_iter_fit_ == 3
@@ -0,0 +1,21 @@
+import torch
+
+from jmstate import MultiStateJointModel
+
+from .conftest import simulate
+
+
+def test_adaptive_quadrature_saves_evaluations(design, params):
+    fixed = MultiStateJointModel(design, params)
+    adaptive = MultiStateJointModel(design, params, quad_tol=1e-4)
+    data = simulate(fixed)
+    fixed._prepare_data(data)
+    adaptive._prepare_data(data)
+
+    b = torch.zeros(3, data.size, 2)
+    with torch.no_grad():
+        expected = fixed._hazard_ll(fixed._psi(b), data)
+        actual = adaptive._hazard_ll(adaptive._psi(b), data)
+
+    assert adaptive.quad_evals_saved_ > 0
+    assert torch.allclose(actual, expected, rtol=1e-4, atol=1e-4)
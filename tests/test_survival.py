@@ -0,0 +1,50 @@
+import torch
+
+from jmstate import MultiStateJointModel
+from jmstate.utils import ModelDesign, SampleData
+
+from .conftest import KEYS, identity, linear, log_gompertz
+
+
+class CountingLink:
+    """A linear link counting the time points it is evaluated at."""
+
+    def __init__(self):
+        self.n_points = 0
+
+    def __call__(
+        self, t: torch.Tensor, x: torch.Tensor, psi: torch.Tensor
+    ) -> torch.Tensor:
+        self.n_points += t.numel()
+        return linear(t, x, psi)
+
+
+def test_survival_horizons_share_a_grid(params):
+    link = CountingLink()
+    design = ModelDesign(identity, linear, {key: (log_gompertz, link) for key in KEYS})
+    model = MultiStateJointModel(design, params)
+
+    n, n_points = 20, 12
+    torch.manual_seed(0)
+    x = torch.randn(n, 1)
+    psi = model.model_design.f(params.gamma, 0.1 * torch.randn(n, 2))
+    sample_data = SampleData(x, [[(1.0, 0)] for _ in range(n)], psi)
+    u = 1.0 + 10.0 * torch.rand(n, n_points)
+
+    with torch.no_grad():
+        log_probs = model.compute_surv_log_probs(sample_data, u)
+
+    # Both transitions out of state 0 are integrated on a single grid per row
+    assert link.n_points == 2 * n * (model.n_quad + 2 * n_points)
+
+    # The hazard is log-linear in time, so the cumulative hazard is exact
+    expected = torch.zeros(n, n_points)
+    for key in [(0, 1), (0, 2)]:
+        alpha, beta = params.alphas[key], params.betas[key]
+        intercept = -2.0 - 0.05 + 0.01 + alpha * psi[:, [0]] + x @ beta.view(-1, 1)
+        slope = 0.05 + alpha * psi[:, [1]]
+        expected += (
+            torch.exp(intercept) * (torch.exp(slope * u) - torch.exp(slope)) / slope
+        )
+
+    assert torch.allclose(log_probs, -expected, rtol=1e-4, atol=1e-5)